@@ -0,0 +1,61 @@
+import itertools
+
+import click
+import pytest
+from click.testing import CliRunner as ClickCliRunner
+from typer.main import get_command
+
+from whisper.ai import classifier
+from whisper.cli import app
+from whisper.config import settings
+
+_test_numbers = itertools.count()
+
+
+@pytest.fixture(autouse=True)
+def isolated_ai_cache(tmp_path_factory, monkeypatch):
+    """
+    Keep the AI response cache and parsed config copies out of the user's home
+    directory, and give each test its own, so nothing cached by one test can
+    answer for another, whatever order or worker (e.g. under pytest-xdist) the
+    tests run in. The directory is only created if a test actually uses it.
+    """
+    cache_home = tmp_path_factory.getbasetemp() / "xdg-cache" / str(next(_test_numbers))
+    monkeypatch.setenv("XDG_CACHE_HOME", str(cache_home))
+    yield
+    # Shared clients hold their cache, and its in-memory verdicts, across tests
+    classifier._get_ollama_client.cache_clear()
+
+
+@pytest.fixture(autouse=True)
+def clear_config_cache():
+    """Ensure each test starts with an empty config file cache."""
+    settings.clear_config_cache()
+    yield
+    settings.clear_config_cache()
+
+
+class WorkerRunner(ClickCliRunner):
+    """
+    A CLI runner bound to a single, pre-built Click command, so the command
+    tree isn't rebuilt from the Typer app on every invocation.
+    """
+
+    def __init__(self, command: click.Command, **kwargs):
+        super().__init__(**kwargs)
+        self.command = command
+
+    def invoke(self, args=None, **kwargs):
+        return super().invoke(self.command, args, **kwargs)
+
+
+@pytest.fixture(scope="session")
+def cli_command() -> click.Command:
+    """The Click command tree for the `whisper` app, built once per test session."""
+    return get_command(app)
+
+
+@pytest.fixture(scope="session")
+def worker(cli_command: click.Command) -> WorkerRunner:
+    """A shared runner for the `whisper` CLI."""
+    return WorkerRunner(cli_command)
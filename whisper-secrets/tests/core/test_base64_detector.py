@@ -0,0 +1,68 @@
+# whisper/tests/core/detectors/test_base64_detector.py
+import base64
+import os
+import random
+import string
+
+from whisper.core.detectors import base64_detector
+from whisper.core.detectors.base64_detector import Base64Detector
+
+
+def test_base64_detector_finds_high_entropy_string():
+    """
+    Verify the detector reports a quoted Base64 string of random bytes.
+    """
+    candidate = base64.b64encode(bytes(range(0, 240, 5))).decode("ascii")
+    content = f'key = "{candidate}"'
+
+    findings = list(Base64Detector().detect(content))
+
+    assert findings == [(candidate, 1, content, "Base64")]
+
+
+def test_base64_detector_skips_repetitive_strings_without_decoding(monkeypatch):
+    """
+    Verify candidates too repetitive to decode to high-entropy data are ruled out before they are decoded.
+    """
+    decoded = []
+    original = base64.b64decode
+    monkeypatch.setattr(base64_detector.base64, "b64decode", lambda data: decoded.append(data) or original(data))
+    content = '\n'.join([
+        'a = "' + "A" * 64 + '"',
+        'b = "' + "ab" * 32 + '"',
+    ])
+
+    assert list(Base64Detector().detect(content)) == []
+    assert decoded == []
+
+
+def test_base64_detector_prefilter_keeps_random_secrets():
+    """
+    Verify the pre-filter never drops a candidate that decodes to random bytes.
+    """
+    detector = Base64Detector()
+    for _ in range(200):
+        candidate = base64.b64encode(os.urandom(48)).decode("ascii")
+        assert len(list(detector.detect(f'"{candidate}"'))) == 1
+
+
+def test_base64_detector_prefilter_never_changes_findings(monkeypatch):
+    """
+    Verify the pre-filter only rules out candidates that decoding would reject too,
+    including strings over a handful of characters that decode to high-entropy bytes.
+    """
+    rng = random.Random(0)
+    candidates = []
+    for size in (1, 2, 3, 4, 5, 8, 16, 64):
+        alphabet = rng.sample(string.ascii_letters + string.digits + "+/", size)
+        for length in (32, 48, 64, 96):
+            candidates.append("".join(rng.choice(alphabet) for _ in range(length)))
+    content = "\n".join(f'"{candidate}"' for candidate in candidates)
+
+    findings = list(Base64Detector().detect(content))
+    monkeypatch.setattr(base64_detector, "_max_decoded_entropy", lambda candidate: float("inf"))
+    unfiltered = list(Base64Detector().detect(content))
+
+    assert findings == unfiltered
+    # Four characters are enough for decoded entropy above the 4.5 threshold
+    assert any(len(set(finding[0])) <= 4 for finding in findings)
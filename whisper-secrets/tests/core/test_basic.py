@@ -1,8 +1,12 @@
+import os
 import pytest
+import stat
+import subprocess
+import sys
 from unittest.mock import patch
 import yaml
 
-from whisper.config.settings import load_config, DEFAULT_CONFIG
+from whisper.config.settings import load_config, find_config_file, clear_config_cache, deep_merge, DEFAULT_CONFIG, YamlDumper, _parsed_copy_path
 
 
 @patch('whisper.config.settings.find_config_file')
@@ -22,7 +26,7 @@ def test_load_config_with_user_overrides(mock_find_config, tmp_path):
         "rules": {"excluded_paths": ["/test/only/this/path"]},
     }
     config_file = tmp_path / "whisper.config.yaml"
-    config_file.write_text(yaml.dump(user_config_content))
+    config_file.write_text(yaml.dump(user_config_content, Dumper=YamlDumper))
     mock_find_config.return_value = config_file
 
     # Act: Load the configuration
@@ -32,4 +36,144 @@ def test_load_config_with_user_overrides(mock_find_config, tmp_path):
     assert config["ai"]["model"] == "custom-model:latest"
     assert config["rules"]["excluded_paths"] == ["/test/only/this/path"]
     # Assert that a default value not in the user config is still present
-    assert "max_file_size" in config["rules"]
\ No newline at end of file
+    assert "max_file_size" in config["rules"]
+
+@patch('whisper.config.settings.find_config_file')
+def test_load_config_reuses_cache_until_file_changes(mock_find_config, tmp_path):
+    """Test that an unchanged config file is parsed once and edits are picked up."""
+    config_file = tmp_path / "whisper.config.yaml"
+    config_file.write_text(yaml.dump({"ai": {"model": "first-model"}}, Dumper=YamlDumper))
+    mock_find_config.return_value = config_file
+
+    with patch('yaml.load', wraps=yaml.load) as mock_load:
+        first = load_config()
+        second = load_config()
+        assert mock_load.call_count == 1
+        assert first["ai"]["model"] == second["ai"]["model"] == "first-model"
+
+        # A change in size invalidates the cached entry.
+        config_file.write_text(yaml.dump({"ai": {"model": "a-different-model"}}, Dumper=YamlDumper))
+        third = load_config()
+        assert mock_load.call_count == 2
+        assert third["ai"]["model"] == "a-different-model"
+
+
+@patch('whisper.config.settings.find_config_file')
+def test_load_config_reuses_the_parsed_copy_across_processes(mock_find_config, tmp_path):
+    """Test that a fresh process loads an unchanged config from its JSON copy, without PyYAML."""
+    config_file = tmp_path / "whisper.config.yaml"
+    config_file.write_text(yaml.dump({"ai": {"model": "cached-model"}}, Dumper=YamlDumper))
+    mock_find_config.return_value = config_file
+    load_config()
+
+    code = (
+        "import sys; from pathlib import Path; from whisper.config import settings; "
+        f"settings.find_config_file = lambda start_path: Path({str(config_file)!r}); "
+        "print(settings.load_config()['ai']['model'], 'yaml' in sys.modules)"
+    )
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+
+    assert result.stdout.split() == ["cached-model", "False"]
+
+
+@patch('whisper.config.settings.find_config_file')
+def test_load_config_parsed_copy_is_private_to_the_user(mock_find_config, tmp_path):
+    """Test that the JSON copy of a config file, which may hold credentials, is only readable by its owner."""
+    config_file = tmp_path / "whisper.config.yaml"
+    config_file.write_text("ai:\n  model: private-model\n")
+    config_file.chmod(0o644)
+    mock_find_config.return_value = config_file
+
+    load_config()
+
+    copy_path = _parsed_copy_path(config_file)
+    assert stat.S_IMODE(os.stat(copy_path).st_mode) == 0o600
+    assert stat.S_IMODE(os.stat(copy_path.parent).st_mode) == 0o700
+
+
+@patch('whisper.config.settings.find_config_file')
+def test_load_config_without_parsed_copy_when_disabled(mock_find_config, tmp_path, monkeypatch):
+    """Test that WHISPER_NO_CONFIG_CACHE stops load_config from reading or writing a JSON copy."""
+    config_file = tmp_path / "whisper.config.yaml"
+    config_file.write_text("ai:\n  model: uncached-model\n")
+    mock_find_config.return_value = config_file
+    monkeypatch.setenv("WHISPER_NO_CONFIG_CACHE", "1")
+
+    with patch('yaml.load', wraps=yaml.load) as mock_load:
+        load_config()
+        clear_config_cache()
+        config = load_config()
+
+    assert mock_load.call_count == 2
+    assert config["ai"]["model"] == "uncached-model"
+    assert not _parsed_copy_path(config_file).exists()
+
+
+@patch('whisper.config.settings.find_config_file')
+def test_load_config_ignores_errors_writing_the_parsed_copy(mock_find_config, tmp_path):
+    """Test that a failure to write the JSON copy, of any kind, never fails loading the config."""
+    config_file = tmp_path / "whisper.config.yaml"
+    config_file.write_text("ai:\n  model: unwritable-model\n")
+    mock_find_config.return_value = config_file
+
+    with patch('whisper.config.settings.os.replace', side_effect=ValueError("bad copy")):
+        config = load_config()
+
+    assert config["ai"]["model"] == "unwritable-model"
+    copy_path = _parsed_copy_path(config_file)
+    assert not copy_path.exists()
+    assert list(copy_path.parent.iterdir()) == []
+
+
+@patch('whisper.config.settings.find_config_file')
+def test_load_config_parses_values_json_cannot_hold_every_time(mock_find_config, tmp_path):
+    """Test that configs with YAML-only values, like dates, aren't served from a lossy JSON copy."""
+    config_file = tmp_path / "whisper.config.yaml"
+    config_file.write_text("ai:\n  model: dated-model\n  since: 2024-01-01\n")
+    mock_find_config.return_value = config_file
+
+    with patch('yaml.load', wraps=yaml.load) as mock_load:
+        load_config()
+        clear_config_cache()
+        config = load_config()
+
+    assert mock_load.call_count == 2
+    assert str(config["ai"]["since"]) == "2024-01-01"
+
+
+@patch('whisper.config.settings.find_config_file')
+def test_load_config_does_not_modify_defaults(mock_find_config, tmp_path):
+    """Test that user overrides and caller mutations never leak into DEFAULT_CONFIG."""
+    config_file = tmp_path / "whisper.config.yaml"
+    config_file.write_text(yaml.dump({"ai": {"model": "custom-model:latest"}}, Dumper=YamlDumper))
+    mock_find_config.return_value = config_file
+
+    config = load_config()
+    config["rules"]["excluded_paths"].append("**/extra/**")
+
+    assert DEFAULT_CONFIG["ai"]["model"] == "whisper/secrets-detector:latest"
+    assert "**/extra/**" not in DEFAULT_CONFIG["rules"]["excluded_paths"]
+
+
+def test_find_config_file_searches_upwards_for_a_regular_file(tmp_path):
+    """Test that the nearest ancestor's config file is found and directories with its name are skipped."""
+    project = tmp_path / "project"
+    nested = project / "src" / "pkg"
+    (nested / "whisper.config.yaml").mkdir(parents=True)
+    (project / "whisper.config.yaml").write_text("ai: {}\n")
+
+    assert find_config_file(nested) == project / "whisper.config.yaml"
+    assert find_config_file(project) == project / "whisper.config.yaml"
+
+
+def test_deep_merge_merges_nested_dicts_and_replaces_other_values():
+    """Test that nested dicts merge key by key and a dict replaces a non-dict value."""
+    destination = {"ai": {"model": "default", "host": "local"}, "rules": None, "keep": 1}
+    source = {"ai": {"model": "custom", "options": {"temperature": 0}}, "rules": {"excluded_paths": []}}
+
+    assert deep_merge(source, destination) is destination
+    assert destination == {
+        "ai": {"model": "custom", "host": "local", "options": {"temperature": 0}},
+        "rules": {"excluded_paths": []},
+        "keep": 1,
+    }
@@ -0,0 +1,311 @@
+import json
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock, patch
+
+import pytest
+import requests
+
+from whisper.ai import ollama_client
+from whisper.ai.classifier import SecretClassifier
+from whisper.ai.ollama_client import OllamaClient
+from whisper.ai.response_cache import ResponseCache
+
+
+def _ollama_response(candidate):
+    """Builds a fake Ollama /api/generate response for a candidate."""
+    response = MagicMock()
+    response.content = json.dumps(
+        {"response": json.dumps({"is_secret": candidate.startswith("real"), "reason": f"checked {candidate}"})}
+    ).encode("utf-8")
+    return response
+
+
+def test_classify_candidates_keeps_order_and_shares_a_session():
+    """
+    Verify batched classification returns results in input order over one session.
+    """
+    client = OllamaClient(model="test-model", host="http://ollama:11434")
+    items = [(f"real-{i}" if i % 2 else f"fake-{i}", f"context {i}") for i in range(10)]
+
+    with patch.object(requests.Session, "post", autospec=True) as mock_post:
+        mock_post.side_effect = lambda session, url, data, headers, timeout: _ollama_response(
+            json.loads(data)["prompt"].split('Candidate Secret: "')[1].split('"')[0]
+        )
+        results = client.classify_candidates(items)
+
+    assert [r["reason"] for r in results] == [f"checked {candidate}" for candidate, _ in items]
+    assert [r["is_secret"] for r in results] == [i % 2 == 1 for i in range(10)]
+    assert len({id(call.args[0]) for call in mock_post.call_args_list}) == 1
+    assert mock_post.call_args.args[1] == "http://ollama:11434/api/generate"
+
+
+def test_classify_candidates_reports_failed_requests_per_item():
+    """
+    Verify a failed request only affects its own item.
+    """
+    client = OllamaClient(model="test-model")
+
+    def post(session, url, data, headers, timeout):
+        if "boom" in json.loads(data)["prompt"]:
+            raise requests.exceptions.ConnectionError("refused")
+        return _ollama_response("real")
+
+    with patch.object(requests.Session, "post", autospec=True, side_effect=post):
+        results = client.classify_candidates([("real", "ok"), ("boom", "bad")])
+
+    assert results[0]["is_secret"] is True
+    assert results[1] == {"is_secret": False, "reason": "Ollama API request failed: refused"}
+    assert client.classify_candidates([]) == []
+
+
+def test_secret_classifier_classify_batch_delegates_to_client():
+    """
+    Verify classify_batch passes (candidate, context) pairs to the AI client.
+    """
+    classifier = SecretClassifier(config={"ai": {"primary": "ollama", "model": "test-model"}})
+    classifier.ai_client = MagicMock()
+    classifier.ai_client.classify_candidates.return_value = [{"is_secret": True, "reason": "r"}]
+
+    results = classifier.classify_batch([{"candidate": "s3cr3t", "context": "key = 's3cr3t'"}])
+
+    classifier.ai_client.classify_candidates.assert_called_once_with([("s3cr3t", "key = 's3cr3t'")])
+    assert results == [{"is_secret": True, "reason": "r"}]
+
+
+def test_concurrency_comes_from_ai_config():
+    """
+    Verify `ai.concurrency` sets how many requests the client sends at once.
+    """
+    configured = SecretClassifier(config={"ai": {"primary": "ollama", "model": "m", "concurrency": 8}})
+    default = SecretClassifier(config={"ai": {"primary": "ollama", "model": "m"}})
+
+    assert configured.ai_client.concurrency == 8
+    assert default.ai_client.concurrency == 4
+    assert OllamaClient(model="m", concurrency=1000).concurrency == ollama_client._POOL_MAXSIZE
+    with patch.object(requests.Session, "post", autospec=True, side_effect=lambda *a, **k: _ollama_response("real")), \
+            patch("whisper.ai.ollama_client.ThreadPoolExecutor", wraps=ThreadPoolExecutor) as pool:
+        configured.classify_batch([{"candidate": "real", "context": ""}])
+    pool.assert_called_once_with(max_workers=8)
+
+
+def test_classifiers_with_the_same_settings_share_a_client():
+    """
+    Verify the Ollama client is built once per (model, host, concurrency, cache) setting.
+    """
+    config = {"ai": {"primary": "ollama", "model": "shared-model", "host": "http://ollama:11434"}}
+
+    first = SecretClassifier(config=config)
+    second = SecretClassifier(config={"ai": dict(config["ai"])})
+    other = SecretClassifier(config={"ai": dict(config["ai"], model="other-model")})
+
+    assert first.ai_client is second.ai_client
+    assert other.ai_client is not first.ai_client
+    assert first.ai_client.api_url == "http://ollama:11434/api/generate"
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_classify_candidate_sends_and_parses_json_bytes(use_orjson):
+    """
+    Verify the payload is sent as JSON bytes and the response is parsed the same with or without orjson.
+    """
+    client = OllamaClient(model="test-model", host="http://ollama:11434")
+    replacement = ollama_client.orjson if use_orjson else None
+    if use_orjson and replacement is None:
+        pytest.skip("orjson is not installed")
+
+    with patch.object(ollama_client, "orjson", replacement), \
+            patch.object(requests.Session, "post", return_value=_ollama_response("real-key")) as post:
+        result = client.classify_candidate("real-key", "token = 'real-key'")
+
+    assert result == {"is_secret": True, "reason": "checked real-key"}
+    _, kwargs = post.call_args
+    assert kwargs["headers"] == {"Content-Type": "application/json"}
+    payload = json.loads(kwargs["data"])
+    assert payload["model"] == "test-model"
+    assert payload["format"] == "json"
+    assert payload["options"] == {"num_predict": 96, "num_ctx": 4096, "temperature": 0.0, "top_k": 1}
+    assert 'Candidate Secret: "real-key"' in payload["prompt"]
+
+
+def test_classify_candidate_reports_malformed_model_output():
+    """
+    Verify a response that isn't valid JSON is reported rather than raised.
+    """
+    client = OllamaClient(model="test-model")
+    response = MagicMock()
+    response.content = b'{"response": "not json"}'
+
+    with patch.object(requests.Session, "post", return_value=response):
+        result = client.classify_candidate("candidate", "context")
+
+    assert result == {"is_secret": False, "reason": "Failed to decode JSON response from model."}
+
+
+def test_build_prompt_is_dedented_and_fills_both_slots():
+    """
+    Verify the prompt has no template indentation and places context and candidate in order.
+    """
+    prompt = OllamaClient(model="test-model")._build_prompt("s3cr3t", "key = 's3cr3t'")
+
+    assert prompt.startswith("You are an expert security analyst")
+    assert not any(line.startswith(" ") for line in prompt.splitlines())
+    assert "Code Context:\n```\nkey = 's3cr3t'\n```\n\nCandidate Secret: \"s3cr3t\"\n" in prompt
+    assert prompt.rstrip().endswith('"reason" (a brief explanation).')
+
+
+def test_single_and_batched_requests_reuse_the_shared_session():
+    """
+    Verify every request goes through one keep-alive session with retrying adapters.
+    """
+    client = OllamaClient(model="test-model")
+
+    with patch.object(requests.Session, "post", autospec=True, return_value=_ollama_response("real")) as mock_post:
+        client.classify_candidate("real", "ctx")
+        client.classify_candidates([("real-1", "ctx"), ("real-2", "ctx")])
+        OllamaClient(model="other-model").classify_candidate("real", "ctx")
+
+    sessions = {id(call.args[0]) for call in mock_post.call_args_list}
+    assert sessions == {id(ollama_client._shared_session())}
+    session = ollama_client._shared_session()
+    assert session.headers["Connection"] == "keep-alive"
+    assert session.get_adapter("http://localhost:11434").max_retries.total == 2
+
+
+@pytest.mark.parametrize("position", [0, 1500, 5000, 9980])
+def test_build_prompt_trims_long_context_around_the_candidate(position):
+    """
+    Verify an oversized context is cut to MAX_CONTEXT_CHARS while keeping the candidate in view.
+    """
+    candidate = "sk_live_0123456789"
+    context = "x" * position + candidate + "y" * (10000 - position)
+
+    trimmed = ollama_client._trim_context(context, candidate)
+    prompt = OllamaClient(model="test-model")._build_prompt(candidate, context)
+
+    assert len(trimmed) == ollama_client.MAX_CONTEXT_CHARS
+    assert candidate in trimmed
+    assert f"```\n{trimmed}\n```" in prompt
+    assert ollama_client._trim_context("short", candidate) == "short"
+
+
+def test_classify_batch_skips_the_model_for_prejudged_candidates():
+    """
+    Verify placeholders are answered locally and only the rest are sent to the AI client, in order.
+    """
+    classifier = SecretClassifier(config={"ai": {"primary": "ollama", "model": "test-model"}})
+    classifier.ai_client = MagicMock()
+    classifier.ai_client.classify_candidates.return_value = [{"is_secret": True, "reason": "model"}]
+
+    results = classifier.classify_batch([
+        {"candidate": "changeme", "context": "password = 'changeme'"},
+        {"candidate": "s3cr3t", "context": "key = 's3cr3t'"},
+    ])
+
+    classifier.ai_client.classify_candidates.assert_called_once_with([("s3cr3t", "key = 's3cr3t'")])
+    assert [r["is_secret"] for r in results] == [False, True]
+    assert results[1]["reason"] == "model"
+
+    classifier.ai_client.reset_mock()
+    assert classifier.classify("${TOKEN}", "token = '${TOKEN}'")["is_secret"] is False
+    assert classifier.classify_batch([{"candidate": "xxxx", "context": "x"}])[0]["is_secret"] is False
+    classifier.ai_client.classify_candidate.assert_not_called()
+    classifier.ai_client.classify_candidates.assert_not_called()
+
+
+def _chat_response(results):
+    """Builds a fake Ollama /api/chat response whose message holds `results`."""
+    response = MagicMock()
+    response.content = json.dumps({"message": {"content": json.dumps({"results": results})}}).encode("utf-8")
+    return response
+
+
+def test_classify_candidates_sends_a_shared_context_once(tmp_path):
+    """
+    Verify candidates sharing a context are classified in one chat request and cached individually.
+    """
+    client = OllamaClient(model="m", host="http://ollama:11434", cache=ResponseCache(tmp_path / "c.sqlite3"))
+    context = "aws_key = 'AKIA1'; aws_secret = 's3cr3t'"
+    answers = [{"is_secret": True, "reason": "key"}, {"is_secret": False, "reason": "test"}]
+
+    with patch.object(requests.Session, "post", autospec=True) as mock_post:
+        mock_post.side_effect = lambda session, url, data, headers, timeout: (
+            _chat_response(answers) if url.endswith("/api/chat") else _ollama_response("real")
+        )
+        results = client.classify_candidates([("AKIA1", context), ("other", "elsewhere"), ("s3cr3t", context)])
+        assert client.classify_candidates([("s3cr3t", context)]) == [answers[1]]
+
+    assert results == [answers[0], {"is_secret": True, "reason": "checked real"}, answers[1]]
+    urls = sorted(call.args[1] for call in mock_post.call_args_list)
+    assert urls == ["http://ollama:11434/api/chat", "http://ollama:11434/api/generate"]
+    chat = json.loads(next(c.kwargs["data"] for c in mock_post.call_args_list if c.args[1].endswith("/api/chat")))
+    assert json.loads(chat["messages"][1]["content"]) == ["AKIA1", "s3cr3t"]
+    assert context in chat["messages"][0]["content"]
+    assert chat["options"]["num_predict"] == 2 * 96
+
+
+def test_classify_candidates_in_context_falls_back_on_mismatched_answers():
+    """
+    Verify a grouped answer with the wrong number of results is retried one candidate at a time.
+    """
+    client = OllamaClient(model="m", host="http://ollama:11434")
+
+    with patch.object(requests.Session, "post", autospec=True) as mock_post:
+        mock_post.side_effect = lambda session, url, data, headers, timeout: (
+            _chat_response([{"is_secret": True}]) if url.endswith("/api/chat")
+            else _ollama_response(json.loads(data)["prompt"].split('Candidate Secret: "')[1].split('"')[0])
+        )
+        results = client.classify_candidates_in_context("ctx", ["real-a", "fake-b"])
+
+    assert results == [
+        {"is_secret": True, "reason": "checked real-a"},
+        {"is_secret": False, "reason": "checked fake-b"},
+    ]
+    assert [call.args[1].rsplit("/", 1)[1] for call in mock_post.call_args_list] == ["chat", "generate", "generate"]
+
+
+def test_group_requests_fit_the_context_window():
+    """
+    Verify a full group with the longest context stays within num_ctx, counting the
+    prompt's tokens at their upper bound, and larger groups are split.
+    """
+    client = OllamaClient(model="m", host="http://ollama:11434")
+    context = "".join(chr(33 + (i * 7919) % 94) for i in range(ollama_client.MAX_CONTEXT_CHARS))
+    items = [(f"candidate-{i:02d}-" + "x" * 48, context) for i in range(20)]
+
+    with patch.object(requests.Session, "post", autospec=True) as mock_post:
+        mock_post.side_effect = lambda session, url, data, headers, timeout: _chat_response(
+            [{"is_secret": True, "reason": "r"}] * len(json.loads(json.loads(data)["messages"][1]["content"]))
+        )
+        client.classify_candidates(items)
+
+    payloads = [json.loads(call.kwargs["data"]) for call in mock_post.call_args_list]
+    assert [len(json.loads(p["messages"][1]["content"])) for p in payloads] == [8, 8, 4]
+    for payload in payloads:
+        prompt_tokens = sum(ollama_client._max_tokens(m["content"]) for m in payload["messages"])
+        assert prompt_tokens + payload["options"]["num_predict"] <= payload["options"]["num_ctx"]
+
+
+def test_group_request_falls_back_when_it_might_overflow_the_window():
+    """
+    Verify a group whose prompt might not fit the context window is sent one candidate at a time.
+    """
+    client = OllamaClient(model="m", host="http://ollama:11434")
+    candidates = ["real-" + "a" * 2000, "fake-" + "b" * 2000]
+
+    with patch.object(requests.Session, "post", autospec=True) as mock_post:
+        mock_post.side_effect = lambda session, url, data, headers, timeout: _ollama_response("real")
+        client.classify_candidates_in_context("ctx", candidates)
+
+    assert [call.args[1].rsplit("/", 1)[1] for call in mock_post.call_args_list] == ["generate", "generate"]
+
+
+def test_client_urls_follow_ollama_host_without_a_trailing_slash(monkeypatch):
+    """
+    Verify the default host comes from OLLAMA_HOST, read when the client is built.
+    """
+    monkeypatch.setenv("OLLAMA_HOST", "http://gpu-box:11434/")
+    assert OllamaClient(model="m").api_url == "http://gpu-box:11434/api/generate"
+
+    monkeypatch.delenv("OLLAMA_HOST")
+    assert OllamaClient(model="m").chat_url == "http://localhost:11434/api/chat"
+    assert OllamaClient(model="m", host="http://ollama:11434/").api_url == "http://ollama:11434/api/generate"
@@ -1,17 +1,21 @@
-from typer.testing import CliRunner
-from unittest.mock import patch, MagicMock
+from unittest.mock import PropertyMock, patch
 from unittest import mock
+import copy
+import importlib.metadata
+import importlib.util
 import json
+import logging
 import requests
+import subprocess
+import sys
 from pathlib import Path
+from types import MappingProxyType, SimpleNamespace
 import pytest
+import typer
 import yaml
 
-from whisper.cli import importlib
-from whisper.cli import logging
-from whisper.cli import app
-
-runner = CliRunner()
+from whisper.cli import MODELFILE_TEMPLATE, _format_size, _run_ollama, contribute_pattern, report_false_positive, update
+from whisper.config.settings import DEFAULT_CONFIG, YamlLoader
 
 MOCK_FINDINGS = [
     {
@@ -23,84 +27,162 @@ MOCK_FINDINGS = [
     }
 ]
 
-MOCK_MODELS_RESPONSE = {
-    "models": [
-        {
+# Read-only so that no test can leak changes into another through this payload.
+MOCK_MODELS_RESPONSE = MappingProxyType({
+    "models": (
+        MappingProxyType({
             "name": "codellama:7b",
             "size": 4109865159,
             "modified_at": "2024-01-01T19:48:47.9334029Z",
-        },
-        {
+        }),
+        MappingProxyType({
             "name": "llama3:latest",
             "size": 4661224676,
             "modified_at": "2024-02-15T14:18:43.4969353Z",
-        },
-    ]
-}
+        }),
+    )
+})
 
-@patch('whisper.cli.subprocess.Popen')
-@patch('whisper.cli.shutil.which', return_value=True)
-@patch('whisper.cli.load_config')
-def test_setup_command_pulls_model_from_config(mock_load_config, mock_shutil_which, mock_popen):
+
+def fake_process(chunks=(), returncode=0):
     """
-    Verify the setup command calls `ollama pull` with the model from the config.
+    A minimal stand-in for a `subprocess.Popen` object that yields `chunks`
+    from `stdout.read1()` and then exits with `returncode`.
     """
-    # Arrange: Mock the configuration and the subprocess call
-    mock_load_config.return_value = {"ai": {"model": "model-from-config:latest"}}
+    remaining = iter(chunks)
+    return SimpleNamespace(
+        stdout=SimpleNamespace(read1=lambda size=-1: next(remaining, b"")),
+        wait=lambda: returncode,
+        returncode=returncode,
+    )
+
+
+def fake_response(payload=None, error=None):
+    """
+    A minimal stand-in for a `requests.Response` whose `json()` returns
+    `payload` and whose `raise_for_status()` raises `error`, if given.
+    """
+    def raise_for_status():
+        if error is not None:
+            raise error
+
+    return SimpleNamespace(json=lambda: payload, raise_for_status=raise_for_status)
+
+
+class FakePopen:
+    """
+    A plain stand-in for `subprocess.Popen` that records the arguments of each
+    call and returns `process`, without MagicMock's attribute machinery.
+    """
+
+    def __init__(self, process):
+        self.process = process
+        self.calls = []
+
+    def __call__(self, *args, **kwargs):
+        self.calls.append((args, kwargs))
+        return self.process
+
+
+@pytest.fixture(autouse=True)
+def cli_mocks(monkeypatch):
+    """
+    Patches the CLI's scanner and config loader for every test, so no test
+    scans the working directory or depends on a whisper.config.yaml on disk.
+    `ollama` is reported as installed; tests for a missing one override `shutil.which`.
+    """
+    monkeypatch.setattr("shutil.which", lambda name: f"/usr/bin/{name}")
+    with patch('whisper.core.scanner.FileScanner') as file_scanner, \
+            patch('whisper.config.settings.load_config') as load_config:
+        file_scanner.return_value.iter_scan.return_value = []
+        file_scanner.return_value.unscanned_files = []
+        load_config.return_value = copy.deepcopy(DEFAULT_CONFIG)
+        yield SimpleNamespace(FileScanner=file_scanner, load_config=load_config)
+
+
+@pytest.fixture
+def ollama_api(monkeypatch):
+    """
+    Serves Ollama's `/api/tags` endpoint at the default host from a plain fake
+    of `requests.get`. Tests set `ollama_api.tags` to the response to return,
+    or to an exception to raise; it defaults to MOCK_MODELS_RESPONSE.
+    """
+    monkeypatch.delenv("OLLAMA_HOST", raising=False)
+    api = SimpleNamespace(tags=fake_response(MOCK_MODELS_RESPONSE))
+
+    def get(url, **kwargs):
+        assert url == "http://localhost:11434/api/tags"
+        if isinstance(api.tags, Exception):
+            raise api.tags
+        return api.tags
 
-    # Mock the process to simulate a successful run
-    mock_process = MagicMock()
-    mock_process.wait.return_value = 0
-    mock_process.returncode = 0
-    mock_process.stdout.readline.side_effect = ["pulling manifest", "success", ""]
-    mock_popen.return_value = mock_process
+    monkeypatch.setattr("requests.get", get)
+    return api
+
+
+@patch('whisper.cli._run_ollama', return_value=0)
+def test_setup_command_pulls_model_from_config(mock_run_ollama, cli_mocks, worker):
+    """
+    Verify the setup command calls `ollama pull` with the model from the config.
+    """
+    # Arrange: Mock the configuration; the ollama call reports success
+    cli_mocks.load_config.return_value = {"ai": {"model": "model-from-config:latest"}}
 
     # Act: Run the 'setup' command
-    result = runner.invoke(app, ["setup"])
+    result = worker.invoke(["setup"])
 
     # Assert: Check for success and correct command execution
     assert result.exit_code == 0
     assert "Model model-from-config:latest pulled successfully" in result.stdout
-    mock_popen.assert_called_once_with(
-        ["ollama", "pull", "model-from-config:latest"],
-        stdout=-1, stderr=-2, text=True, encoding='utf-8'
+    mock_run_ollama.assert_called_once_with(
+        ["ollama", "pull", "model-from-config:latest"], stream=True
     )
 
 
-@patch('whisper.cli.subprocess.Popen')
-@patch('whisper.cli.shutil.which', return_value=True)
-@patch('whisper.cli.load_config')
-def test_setup_command_uses_cli_option_override(mock_load_config, mock_shutil_which, mock_popen):
+def test_setup_command_uses_cli_option_override(cli_mocks, worker, monkeypatch):
     """
     Verify the setup command uses the --model option to override the config.
     """
     # Arrange: Mock the configuration and the subprocess call
-    mock_load_config.return_value = {"ai": {"model": "should-be-ignored:latest"}}
-    mock_process = MagicMock()
-    mock_process.wait.return_value = 0
-    mock_process.returncode = 0
-    mock_process.stdout.readline.side_effect = [""]
-    mock_popen.return_value = mock_process
+    cli_mocks.load_config.return_value = {"ai": {"model": "should-be-ignored:latest"}}
+    popen = FakePopen(fake_process([b"pulling manifest\n", b"success\n"]))
+    monkeypatch.setattr("subprocess.Popen", popen)
 
     # Act: Run the 'setup' command with the --model flag
-    result = runner.invoke(app, ["setup", "--model", "cli-override-model:v1"])
+    result = worker.invoke(["setup", "--model", "cli-override-model:v1"])
 
     # Assert: Check for success and correct command execution with the override
     assert result.exit_code == 0
     assert "Model cli-override-model:v1 pulled successfully" in result.stdout
-    mock_popen.assert_called_once_with(
-        ["ollama", "pull", "cli-override-model:v1"],
-        stdout=-1, stderr=-2, text=True, encoding='utf-8'
-    )
+    assert "pulling manifest" in result.stdout
+    assert popen.calls == [(
+        (["ollama", "pull", "cli-override-model:v1"],),
+        dict(stdout=-1, stderr=-2),
+    )]
+
+
+def test_setup_command_relays_pull_progress_verbatim(cli_mocks, worker, monkeypatch):
+    """
+    Verify progress redrawn with carriage returns is relayed as-is, not split
+    into lines or interpreted as console markup.
+    """
+    progress = b"pulling [abc] 10%\rpulling [abc] 55%\rpulling [abc] 100%\n"
+    monkeypatch.setattr("subprocess.Popen", FakePopen(fake_process([progress[:20], progress[20:]])))
 
+    result = worker.invoke(["setup", "--model", "m:v1"])
 
-@patch('whisper.cli.shutil.which', return_value=None)
-def test_setup_command_fails_if_ollama_not_found(mock_shutil_which):
+    assert result.exit_code == 0
+    assert progress in result.stdout_bytes
+
+
+def test_setup_command_fails_if_ollama_not_found(worker, monkeypatch):
     """
     Verify the setup command fails gracefully if the `ollama` executable is not found.
     """
+    monkeypatch.setattr("shutil.which", lambda name: None)
+
     # Act: Run the 'setup' command
-    result = runner.invoke(app, ["setup"])
+    result = worker.invoke(["setup"])
 
     # Assert: Check for a non-zero exit code and the correct error message
     assert result.exit_code != 0
@@ -108,92 +190,85 @@ def test_setup_command_fails_if_ollama_not_found(mock_shutil_which):
     assert "Please install Ollama" in result.stdout
 
 
-@patch('whisper.cli.FileScanner')
-def test_scan_command_table_output(mock_file_scanner):
+@pytest.mark.parametrize("args,check_output", [
+    # A table by default
+    ([], lambda output: "Scan Results" in output),
+    # Valid JSON matching the findings when requested
+    (["--format", "json"], lambda output: json.loads(output) == MOCK_FINDINGS),
+])
+def test_scan_command_output_format(args, check_output, cli_mocks, worker):
     """
-    Verify the scan command produces a table output by default.
+    Verify the scan command renders its findings in the requested format.
     """
     # Arrange
-    mock_scanner_instance = mock_file_scanner.return_value
-    mock_scanner_instance.scan.return_value = MOCK_FINDINGS
+    cli_mocks.FileScanner.return_value.iter_scan.return_value = MOCK_FINDINGS
 
     # Act
-    result = runner.invoke(app, ["scan", "."])
+    result = worker.invoke(["scan", "."] + args)
 
     # Assert
     assert result.exit_code == 0
-    assert "Scan Results" in result.stdout
+    assert check_output(result.stdout)
 
 
-@patch('whisper.cli.FileScanner')
-def test_scan_command_json_output(mock_file_scanner):
+def test_scan_command_table_shows_brackets_verbatim(cli_mocks, worker):
     """
-    Verify the scan command produces a valid JSON output when requested.
+    Verify table cells aren't parsed as rich markup, which would hide "[id]"
+    in a path and fail on a stray closing tag in a reason.
     """
-    # Arrange
-    mock_scanner_instance = mock_file_scanner.return_value
-    mock_scanner_instance.scan.return_value = MOCK_FINDINGS
+    cli_mocks.FileScanner.return_value.iter_scan.return_value = [
+        {"file": "pages/[id].tsx", "line": 3, "secret_value": "s", "detector": "Keyword", "reason": "a [/] b"},
+    ]
 
-    # Act
-    result = runner.invoke(app, ["scan", ".", "--format", "json"])
+    result = worker.invoke(["scan", "."])
 
-    # Assert
     assert result.exit_code == 0
-    # Verify the output is a valid JSON that matches our mock findings
-    parsed_output = json.loads(result.stdout)
-    assert parsed_output == MOCK_FINDINGS
+    assert "pages/[id].tsx" in result.stdout
+    assert "a [/] b" in result.stdout
 
 
-@patch('whisper.cli.FileScanner')
-def test_scan_command_fails_with_fail_on_finding_flag(mock_file_scanner):
+@pytest.mark.parametrize("findings,exit_code,expected,unexpected", [
+    (MOCK_FINDINGS, 1, "Failing build due to found secrets", None),
+    # The app exits via `typer.Exit()` with no code, which defaults to 0.
+    ([], 0, "No secrets found", "Failing build"),
+])
+def test_scan_command_fail_on_finding_flag(findings, exit_code, expected, unexpected, cli_mocks, worker):
     """
-    Verify the scan command exits with a non-zero code when findings are present
-    and --fail-on-finding is used.
+    Verify --fail-on-finding exits with a non-zero code only when findings are present.
     """
     # Arrange
-    mock_scanner_instance = mock_file_scanner.return_value
-    mock_scanner_instance.scan.return_value = MOCK_FINDINGS
+    cli_mocks.FileScanner.return_value.iter_scan.return_value = findings
 
     # Act
-    result = runner.invoke(app, ["scan", ".", "--fail-on-finding"])
+    result = worker.invoke(["scan", ".", "--fail-on-finding"])
 
     # Assert
-    assert result.exit_code == 1
-    assert "Failing build due to found secrets" in result.stdout
+    assert result.exit_code == exit_code
+    assert expected in result.stdout
+    if unexpected:
+        assert unexpected not in result.stdout
 
 
-@patch('whisper.cli.FileScanner')
-def test_scan_command_succeeds_with_fail_on_finding_and_no_findings(mock_file_scanner):
+@pytest.mark.parametrize("args,exit_code", [([], 0), (["--fail-on-finding"], 1)])
+def test_scan_command_reports_unscanned_files(args, exit_code, cli_mocks, worker):
     """
-    Verify the scan command exits with a zero code when --fail-on-finding is used
-    but no secrets are found.
+    Verify files the scan failed on are reported, and fail the build with --fail-on-finding.
     """
-    # Arrange
-    mock_scanner_instance = mock_file_scanner.return_value
-    mock_scanner_instance.scan.return_value = []  # No findings
+    cli_mocks.FileScanner.return_value.unscanned_files = [(Path("broken.py"), "OSError()")]
 
-    # Act
-    result = runner.invoke(app, ["scan", ".", "--fail-on-finding"])
+    result = worker.invoke(["scan", ".", *args])
 
-    # Assert
-    # The app exits via `typer.Exit()` with no code, which defaults to 0.
-    assert result.exit_code == 0
-    assert "No secrets found" in result.stdout
-    assert "Failing build" not in result.stdout
+    assert result.exit_code == exit_code
+    assert "1 file(s) could not be scanned" in result.stdout
+    assert ("Failing build due to files that could not be scanned" in result.stdout) == bool(exit_code)
 
 
-@patch('whisper.cli.requests.get')
-def test_models_list_success(mock_requests_get):
+def test_models_list_success(ollama_api, worker):
     """
     Verify the `models list` command displays a table of models on success.
     """
-    # Arrange
-    mock_response = MagicMock()
-    mock_response.json.return_value = MOCK_MODELS_RESPONSE
-    mock_requests_get.return_value = mock_response
-
     # Act
-    result = runner.invoke(app, ["models", "list"])
+    result = worker.invoke(["models", "list"])
 
     # Assert
     assert result.exit_code == 0
@@ -203,50 +278,58 @@ def test_models_list_success(mock_requests_get):
     assert "4.1 GB" in result.stdout # Check that rich.filesize works
 
 
-@patch('whisper.cli.requests.get')
-def test_models_list_no_models(mock_requests_get):
+@pytest.mark.parametrize("size", [0, 1, 999, 1000, 123456, 4109865159, 4661224676, 10 ** 13, 10 ** 27])
+def test_format_size_matches_rich_decimal(size):
+    """
+    Verify the precomputed size formatter renders the same text as `rich.filesize.decimal`.
+    """
+    from rich.filesize import decimal
+
+    assert _format_size(size) == decimal(size)
+
+
+def test_models_list_no_models(ollama_api, worker):
     """
     Verify the `models list` command shows a message when no models are found.
     """
     # Arrange
-    mock_response = MagicMock()
-    mock_response.json.return_value = {"models": []}
-    mock_requests_get.return_value = mock_response
+    ollama_api.tags = fake_response({"models": []})
 
     # Act
-    result = runner.invoke(app, ["models", "list"])
+    result = worker.invoke(["models", "list"])
 
     # Assert
     assert result.exit_code == 0
     assert "No local models found" in result.stdout
 
 
-@patch('whisper.cli.requests.get', side_effect=requests.exceptions.ConnectionError)
-def test_models_list_connection_error(mock_requests_get):
+def test_models_list_connection_error(ollama_api, worker):
     """
     Verify the `models list` command fails gracefully on a connection error.
     """
+    # Arrange
+    ollama_api.tags = requests.exceptions.ConnectionError()
+
     # Act
-    result = runner.invoke(app, ["models", "list"])
+    result = worker.invoke(["models", "list"])
 
     # Assert
     assert result.exit_code != 0
     assert "Could not connect to Ollama" in result.stdout
 
 
-@patch('whisper.cli.FileScanner')
-def test_scan_command_creates_log_file(mock_file_scanner, tmp_path):
+def test_scan_command_creates_log_file(tmp_path, cli_mocks, worker):
     """
     Verify that using --log-file creates a log file with the correct content.
     """
     # Arrange
-    mock_scanner_instance = mock_file_scanner.return_value
-    mock_scanner_instance.scan.return_value = []
+    mock_scanner_instance = cli_mocks.FileScanner.return_value
+    mock_scanner_instance.iter_scan.return_value = []
     log_file = tmp_path / "test.log"
 
     # Act
     # Note: Global options like --log-file must come before the command.
-    result = runner.invoke(app, ["--log-file", str(log_file), "scan", ".", "--confidence-threshold", "0.9"])
+    result = worker.invoke(["--log-file", str(log_file), "scan", ".", "--confidence-threshold", "0.9"])
 
     # Assert
     assert result.exit_code == 0
@@ -258,12 +341,15 @@ def test_scan_command_creates_log_file(mock_file_scanner, tmp_path):
 
 
 @patch('whisper.cli.logging.basicConfig')
-def test_verbose_flag_sets_debug_level(mock_basic_config):
+def test_verbose_flag_sets_debug_level(mock_basic_config, worker, monkeypatch):
     """
     Verify that the --verbose flag sets the logging level to DEBUG.
     """
+    # Arrange: Forget any handler an earlier invocation left installed
+    monkeypatch.setattr("whisper.cli._logging_setup", None)
+
     # Act
-    runner.invoke(app, ["--verbose", "scan", "."])
+    worker.invoke(["--verbose", "scan", "."])
 
     # Assert
     # Check that logging.basicConfig was called with level=logging.DEBUG
@@ -272,74 +358,83 @@ def test_verbose_flag_sets_debug_level(mock_basic_config):
     assert call_kwargs.get("level") == logging.DEBUG
 
 
-def test_scan_command_no_log_file_by_default(tmp_path):
+def test_repeated_invocations_reuse_the_logging_handler(cli_mocks, worker):
+    """
+    Verify later invocations logging to the same place keep the handler and
+    only update the level.
+    """
+    worker.invoke(["scan", "."])
+    handlers = list(logging.root.handlers)
+
+    with patch("whisper.cli.logging.basicConfig") as mock_basic_config:
+        result = worker.invoke(["--verbose", "scan", "."])
+
+    assert result.exit_code == 0
+    mock_basic_config.assert_not_called()
+    assert logging.root.handlers == handlers
+    assert logging.root.level == logging.DEBUG
+
+
+def test_scan_command_no_log_file_by_default(tmp_path, monkeypatch, worker):
     """
     Verify that no log file is created by default.
     """
-    # Use isolated_filesystem to ensure we have a clean directory.
-    with runner.isolated_filesystem(temp_dir=tmp_path) as td:
-        result = runner.invoke(app, ["scan", "."])
-        assert result.exit_code == 0
-        assert not list(Path(td).glob("*.log"))
+    # Run from an empty temporary directory.
+    monkeypatch.chdir(tmp_path)
+    result = worker.invoke(["scan", "."])
+    assert result.exit_code == 0
+    assert not list(tmp_path.glob("*.log"))
 
 
-def test_models_use_creates_new_config(tmp_path):
+def test_models_use_creates_new_config(tmp_path, monkeypatch, worker):
     """
     Verify `models use` creates a new config file if one doesn't exist.
     """
-    with runner.isolated_filesystem(temp_dir=tmp_path) as td:
-        # Arrange: We are in an empty directory
-        config_path = Path(td) / "whisper.config.yaml"
-        assert not config_path.exists()
-
-        # Act
-        result = runner.invoke(app, ["models", "use", "new-model:latest"])
+    monkeypatch.chdir(tmp_path)
+    # Arrange: We are in an empty directory, and no config file exists further up
+    monkeypatch.setattr("whisper.config.settings.find_config_file", lambda start_path: None)
+    config_path = tmp_path / "whisper.config.yaml"
 
-        # Assert
-        assert result.exit_code == 0
-        assert "Creating a new one" in result.stdout
-        assert config_path.exists()
+    # Act
+    result = worker.invoke(["models", "use", "new-model:latest"])
 
-        with open(config_path, 'r') as f:
-            config_data = yaml.safe_load(f)
-        
-        assert config_data == {"ai": {"model": "new-model:latest"}}
+    # Assert
+    assert result.exit_code == 0
+    assert "Creating a new one" in result.stdout
+    assert yaml.load(config_path.read_text(), Loader=YamlLoader) == {"ai": {"model": "new-model:latest"}}
 
 
-def test_models_use_updates_existing_config(tmp_path):
+def test_models_use_updates_existing_config(tmp_path, monkeypatch, worker):
     """
     Verify `models use` updates the model in an existing config file.
     """
-    with runner.isolated_filesystem(temp_dir=tmp_path) as td:
-        # Arrange: Create a pre-existing config file
-        config_path = Path(td) / "whisper.config.yaml"
-        initial_config = {"ai": {"model": "old-model:v1"}, "rules": {"max_file_size": "1MB"}}
-        with open(config_path, 'w') as f:
-            yaml.dump(initial_config, f)
+    # Arrange: Create a pre-existing config file where the command looks for one
+    config_path = tmp_path / "whisper.config.yaml"
+    config_path.write_text("ai:\n  model: old-model:v1\nrules:\n  max_file_size: 1MB\n")
+    monkeypatch.setattr("whisper.config.settings.find_config_file", lambda start_path: config_path)
+
+    # Act
+    result = worker.invoke(["models", "use", "updated-model:v2"])
 
-        # Act
-        result = runner.invoke(app, ["models", "use", "updated-model:v2"])
+    # Assert
+    assert result.exit_code == 0
+    config_data = yaml.load(config_path.read_text(), Loader=YamlLoader)
 
-        # Assert
-        assert result.exit_code == 0
-        with open(config_path, 'r') as f:
-            config_data = yaml.safe_load(f)
-        
-        assert config_data["ai"]["model"] == "updated-model:v2"
-        assert config_data["rules"]["max_file_size"] == "1MB" # Verify other keys are preserved
+    assert config_data["ai"]["model"] == "updated-model:v2"
+    assert config_data["rules"]["max_file_size"] == "1MB" # Verify other keys are preserved
 
 
-@patch('whisper.cli.FileScanner', side_effect=ValueError("A test error occurred"))
-def test_debug_flag_raises_exception(mock_file_scanner):
+def test_debug_flag_raises_exception(cli_mocks, worker):
     """
     Verify that with --debug, an exception is re-raised for a full stack trace.
     """
     # Arrange
+    cli_mocks.FileScanner.side_effect = ValueError("A test error occurred")
     # The CliRunner's invoke method catches exceptions by default.
     # We expect the exception to be caught and stored in the result object.
-    
+
     # Act
-    result = runner.invoke(app, ["--debug", "scan", "."])
+    result = worker.invoke(["--debug", "scan", "."])
 
     # Assert
     assert result.exit_code != 0
@@ -347,16 +442,16 @@ def test_debug_flag_raises_exception(mock_file_scanner):
     assert "A test error occurred" in str(result.exception)
 
 
-@patch('whisper.cli.FileScanner', side_effect=ValueError("A test error occurred"))
-def test_no_debug_flag_shows_clean_error(mock_file_scanner):
+def test_no_debug_flag_shows_clean_error(cli_mocks, worker):
     """
     Verify that without --debug, a clean error message is shown.
     """
     # Arrange
+    cli_mocks.FileScanner.side_effect = ValueError("A test error occurred")
     # The CliRunner will catch the typer.Exit exception.
-    
+
     # Act
-    result = runner.invoke(app, ["scan", "."])
+    result = worker.invoke(["scan", "."])
 
     # Assert
     assert result.exit_code == 1
@@ -364,134 +459,182 @@ def test_no_debug_flag_shows_clean_error(mock_file_scanner):
     assert "An unexpected error occurred: A test error occurred" in result.stdout
 
 
-@patch('whisper.cli.FileScanner')
-@patch('whisper.cli.Progress')
-def test_scan_command_uses_progress_bar(mock_progress_class, mock_file_scanner):
+@patch('rich.console.Console.is_terminal', new_callable=PropertyMock, return_value=True)
+@patch('rich.progress.Progress')
+def test_scan_command_uses_progress_bar(mock_progress_class, mock_is_terminal, cli_mocks, worker):
     """
     Verify that the scan command creates a Progress object and passes it to the scanner.
     """
     # Arrange
     # Mock the scanner instance and the progress context manager
-    mock_scanner_instance = mock_file_scanner.return_value
+    mock_scanner_instance = cli_mocks.FileScanner.return_value
     mock_progress_instance = mock_progress_class.return_value.__enter__.return_value
 
     # Act
-    result = runner.invoke(app, ["scan", "."])
+    result = worker.invoke(["scan", "."])
     # Assert
     assert result.exit_code == 0
     # Verify that a Progress object was created
     mock_progress_class.assert_called_once()
     # Verify that the scanner's scan method was called with the progress instance
-    mock_scanner_instance.scan.assert_called_once_with(progress=mock_progress_instance)
+    mock_scanner_instance.iter_scan.assert_called_once_with(progress=mock_progress_instance)
 
 
-@patch('whisper.cli.Progress')
-@patch('whisper.cli.FileScanner')
-def test_scan_uses_progress_bar_with_options(mock_file_scanner, mock_progress_class):
+@patch('rich.console.Console.is_terminal', new_callable=PropertyMock, return_value=True)
+@patch('rich.progress.Progress')
+def test_scan_uses_progress_bar_with_options(mock_progress_class, mock_is_terminal, cli_mocks, worker):
     """Verify the `scan` command applies max file size from the command line."""
     # Arrange    
-    mock_scanner_instance = mock_file_scanner.return_value
-    mock_scanner_instance.scan.return_value = []
+    mock_scanner_instance = cli_mocks.FileScanner.return_value
+    mock_scanner_instance.iter_scan.return_value = []
     mock_progress_instance = mock_progress_class.return_value.__enter__.return_value
 
     # Act
-    result = runner.invoke(app, ["scan", ".", "--max-file-size", "5"])
+    result = worker.invoke(["scan", ".", "--max-file-size", "5"])
 
     # Assert
-    mock_file_scanner.assert_called_once()
+    cli_mocks.FileScanner.assert_called_once()
     # Assert
     assert result.exit_code == 0
     # Verify that a Progress object was created
     mock_progress_class.assert_called_once()
     # Verify that the scanner's scan method was called with the progress instance
-    mock_scanner_instance.scan.assert_called_once_with(progress=mock_progress_instance)
+    mock_scanner_instance.iter_scan.assert_called_once_with(progress=mock_progress_instance)
+
 
+@patch('rich.progress.Progress')
+def test_scan_skips_progress_bar_when_not_a_terminal(mock_progress_class, cli_mocks, worker):
+    """Verify no progress bar is built when its output isn't a terminal, e.g. in CI logs."""
+    cli_mocks.FileScanner.return_value.iter_scan.return_value = []
 
-@patch('whisper.cli.os.remove')
-@patch('whisper.cli.tempfile.NamedTemporaryFile')
-@patch('whisper.cli.subprocess.Popen')
-@patch('whisper.cli.shutil.which', return_value=True)
-def test_models_create_success(mock_shutil_which, mock_popen, mock_tempfile, mock_os_remove):
+    result = worker.invoke(["scan", "."])
+
+    assert result.exit_code == 0
+    mock_progress_class.assert_not_called()
+    cli_mocks.FileScanner.return_value.iter_scan.assert_called_once_with(progress=None)
+
+
+@patch('whisper.cli._run_ollama', return_value=0)
+def test_models_create_success(mock_run_ollama, worker):
     """
     Verify the `models create` command correctly generates a Modelfile
     and calls `ollama create`.
     """
-    # Arrange
-    # Mock for subprocess.Popen
-    mock_process = MagicMock()
-    mock_process.wait.return_value = 0
-    mock_process.returncode = 0
-    mock_process.stdout.readline.side_effect = [""]
-    mock_popen.return_value = mock_process
-
-    # Mock for tempfile.NamedTemporaryFile to control the file path and check writes
-    mock_file_handle = MagicMock()
-    mock_file_handle.name = "/tmp/fake-modelfile"
-    mock_tempfile.return_value.__enter__.return_value = mock_file_handle
+    # Arrange: Capture the Modelfile while `ollama create` would be reading it
+    modelfiles = {}
+
+    def read_modelfile(argv):
+        modelfiles[argv[-1]] = Path(argv[-1]).read_text()
+        return 0
+
+    mock_run_ollama.side_effect = read_modelfile
 
     # Act
-    result = runner.invoke(app, ["models", "create", "--name", "my-test-model", "--base", "test-base:latest"])
+    result = worker.invoke(["models", "create", "--name", "my-test-model", "--base", "test-base:latest"])
 
     # Assert
     assert result.exit_code == 0
     assert "Model my-test-model created successfully" in result.stdout
 
-    # Verify the Modelfile was written with the correct content
-    mock_file_handle.write.assert_called_once()
-    written_content = mock_file_handle.write.call_args[0][0]
-    assert "FROM test-base:latest" in written_content
-    assert "You are an expert security analyst" in written_content
-
-    # Verify that `ollama create` was called correctly
-    mock_popen.assert_called_once_with(
-        ["ollama", "create", "my-test-model", "-f", "/tmp/fake-modelfile"],
-        stdout=-1, stderr=-2, text=True, encoding='utf-8'
-    )
+    # Verify that `ollama create` was called correctly, with the rendered Modelfile
+    [(modelfile_path, written_content)] = modelfiles.items()
+    mock_run_ollama.assert_called_once_with(["ollama", "create", "my-test-model", "-f", modelfile_path])
+    assert modelfile_path.endswith(".Modelfile")
+    assert written_content == MODELFILE_TEMPLATE.format(base_model="test-base:latest")
 
     # Verify the temporary file was cleaned up
-    mock_os_remove.assert_called_once_with("/tmp/fake-modelfile")
+    assert not Path(modelfile_path).exists()
+
+
+@patch('whisper.cli._run_ollama', side_effect=FileNotFoundError)
+def test_models_create_ollama_not_spawnable(mock_run_ollama, worker):
+    """
+    Verify `models create` reports a missing `ollama` binary and still removes the Modelfile.
+    """
+    result = worker.invoke(["models", "create", "--name", "my-test-model"])
+
+    assert result.exit_code == 1
+    assert "`ollama` command not found" in result.stdout
+    modelfile_path = mock_run_ollama.call_args[0][0][-1]
+    assert not Path(modelfile_path).exists()
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="posix_spawnp and signal exit statuses are POSIX-only")
+@pytest.mark.parametrize("code,expected", [
+    ("import sys; sys.exit(3)", 3),
+    ("pass", 0),
+    ("import os, signal; os.kill(os.getpid(), signal.SIGTERM)", -15),
+])
+def test_run_ollama_spawns_process_and_maps_exit_status(code, expected):
+    """
+    Verify the non-streaming path runs a real process and maps its exit status, including signals.
+    """
+    assert _run_ollama([sys.executable, "-c", code]) == expected
+
+
+def test_run_ollama_raises_for_missing_executable():
+    """
+    Verify a missing executable raises FileNotFoundError, which the commands report.
+    """
+    with pytest.raises(FileNotFoundError):
+        _run_ollama(["whisper-test-no-such-executable"])
 
 
-def test_update_command_default_behavior():
+# The update, report and contribute commands hold no parsing logic of their own,
+# so their tests call the command functions directly instead of going through Click.
+NO_SUBCOMMAND = SimpleNamespace(invoked_subcommand=None)
+
+
+def test_update_command_default_behavior(capsys):
     """
     Verify the default `update` command shows the correct placeholder message.
     """
     # Act
-    result = runner.invoke(app, ["update"])
+    update(NO_SUBCOMMAND, check=False, retrain=False)
 
     # Assert
-    assert result.exit_code == 0
-    assert "Downloading latest security intelligence" in result.stdout
-    assert "Everything is up to date" in result.stdout
+    output = capsys.readouterr().out
+    assert "Downloading latest security intelligence" in output
+    assert "Everything is up to date" in output
 
 
-def test_update_command_with_check_flag():
+def test_update_command_with_check_flag(capsys):
     """
     Verify the `update --check` command shows the correct placeholder message.
     """
     # Act
-    result = runner.invoke(app, ["update", "--check"])
+    update(NO_SUBCOMMAND, check=True, retrain=False)
 
     # Assert
-    assert result.exit_code == 0
-    assert "Checking for available updates" in result.stdout
+    assert "Checking for available updates" in capsys.readouterr().out
 
 
-def test_update_command_with_retrain_flag():
+def test_update_command_with_retrain_flag(capsys):
     """
     Verify the `update --retrain` command shows the correct placeholder message
     and exits with a non-zero code as it is not yet implemented.
     """
     # Act
-    result = runner.invoke(app, ["update", "--retrain"])
+    with pytest.raises(typer.Exit) as exc_info:
+        update(NO_SUBCOMMAND, check=False, retrain=True)
 
     # Assert
-    assert result.exit_code == 1
-    assert "Model retraining is not yet implemented" in result.stdout
+    assert exc_info.value.exit_code == 1
+    assert "Model retraining is not yet implemented" in capsys.readouterr().out
 
 
-@patch('whisper.cli.importlib.metadata.version')
-def test_version_flag_success(mock_metadata_version):
+def test_update_command_runs_through_the_cli(worker):
+    """
+    Verify `update --check` is wired up as a command with its options.
+    """
+    result = worker.invoke(["update", "--check"])
+
+    assert result.exit_code == 0
+    assert "Checking for available updates" in result.stdout
+
+
+@patch('importlib.metadata.version')
+def test_version_flag_success(mock_metadata_version, worker):
     """
     Verify the --version flag prints the correct version when the package is installed.
     """
@@ -499,27 +642,27 @@ def test_version_flag_success(mock_metadata_version):
     mock_metadata_version.return_value = "1.2.3"
 
     # Act
-    result = runner.invoke(app, ["--version"])
+    result = worker.invoke(["--version"])
 
     # Assert
     assert result.exit_code == 0
     assert "Whisper version: 1.2.3" in result.stdout
 
 
-@patch('whisper.cli.importlib.metadata.version', side_effect=importlib.metadata.PackageNotFoundError)
-def test_version_flag_local_build(mock_metadata_version):
+@patch('importlib.metadata.version', side_effect=importlib.metadata.PackageNotFoundError)
+def test_version_flag_local_build(mock_metadata_version, worker):
     """
     Verify the --version flag shows the local build message when the package is not found.
     """
     # Act
-    result = runner.invoke(app, ["--version"])
+    result = worker.invoke(["--version"])
 
     # Assert
     assert result.exit_code == 0
     assert "Whisper version: (local development build)" in result.stdout
 
 
-def test_report_fp_command_success(tmp_path):
+def test_report_fp_command_success(tmp_path, capsys):
     """
     Verify the `report fp` command works correctly with valid arguments.
     """
@@ -528,110 +671,91 @@ def test_report_fp_command_success(tmp_path):
     dummy_file.write_text("some content")
 
     # Act
-    result = runner.invoke(
-        app,
-        [
-            "report",
-            "fp",
-            "--file",
-            str(dummy_file),
-            "--line",
-            "42",
-            "--reason",
-            "This is a test fixture",
-        ],
-    )
+    report_false_positive(file=dummy_file, line=42, reason="This is a test fixture")
 
     # Assert
-    assert result.exit_code == 0
-    # Rich console output can wrap, so check for parts of the path or flatten output
-    assert "Thank you for your contribution!" in result.stdout
+    output = capsys.readouterr().out
+    assert "Thank you for your contribution!" in output
     # Replace newlines to handle potential wrapping of the long path by rich
-    assert str(dummy_file) in result.stdout.replace("\n", "")
-    assert "at line 42" in result.stdout
-    assert "This is a test fixture" in result.stdout
+    assert str(dummy_file) in output.replace("\n", "")
+    assert "at line 42" in output
+    assert "This is a test fixture" in output
 
 
-def test_report_fp_command_fails_on_missing_file():
+def test_report_fp_command_fails_on_missing_file(worker):
     """
     Verify the `report fp` command fails if the specified file does not exist.
     """
     # Act
-    result = runner.invoke(app, ["report", "fp", "--file", "nonexistent.py", "--line", "1", "--reason", "test"])
+    result = worker.invoke(["report", "fp", "--file", "nonexistent.py", "--line", "1", "--reason", "test"])
 
     # Assert
     assert result.exit_code != 0
     # Check for the key parts of the error message in stderr, 
     assert "nonexistent.py" in result.stderr
 
-@patch('whisper.cli.FileScanner')
-def test_scan_command_with_max_file_size(mock_file_scanner):
+def test_scan_command_with_max_file_size(cli_mocks, worker):
     """Verify the `scan` command applies max file size from the command line."""
     # Arrange    
-    mock_scanner_instance = mock_file_scanner.return_value
-    mock_scanner_instance.scan.return_value = []
+    mock_scanner_instance = cli_mocks.FileScanner.return_value
+    mock_scanner_instance.iter_scan.return_value = []
 
     # Act
-    result = runner.invoke(app, ["scan", ".", "--max-file-size", "5"])
+    result = worker.invoke(["scan", ".", "--max-file-size", "5"])
 
     # Assert
     assert result.exit_code == 0
     # Verify FileScanner was called with some config
-    call_args = mock_file_scanner.call_args    
+    call_args = cli_mocks.FileScanner.call_args    
 
     passed_config = call_args[1].get('config')
     assert passed_config["rules"]["max_file_size"] == '5MB'
 
 
-def test_contribute_pattern_command_success():
+def test_scan_command_rejects_malformed_max_file_size(cli_mocks, worker):
+    """Verify a --max-file-size that isn't a size fails before anything is scanned."""
+    result = worker.invoke(["scan", ".", "--max-file-size", "ten"])
+
+    assert result.exit_code == 2
+    assert "is not a size" in result.stderr
+    cli_mocks.FileScanner.assert_not_called()
+
+
+def test_contribute_pattern_command_success(capsys):
     """
     Verify the `contribute pattern` command works correctly with valid arguments.
     """
     # Act
-    result = runner.invoke(
-        app,
-        [
-            "contribute",
-            "pattern",
-            "--name",
-            "My Test Pattern",
-            "--pattern",
-            "test_[a-z]{10}",
-        ],
-    )
+    contribute_pattern(name="My Test Pattern", pattern="test_[a-z]{10}")
 
     # Assert
-    assert result.exit_code == 0
-    assert "Thank you for your contribution!" in result.stdout
-    assert "Suggesting new pattern: My Test Pattern" in result.stdout
-    assert "Pattern: test_[a-z]{10}" in result.stdout
+    output = capsys.readouterr().out
+    assert "Thank you for your contribution!" in output
+    assert "Suggesting new pattern: My Test Pattern" in output
+    assert "Pattern: test_[a-z]{10}" in output
 
 
-def test_contribute_pattern_command_fails_on_missing_option():
+def test_contribute_pattern_command_fails_on_missing_option(worker):
     """
     Verify the `contribute pattern` command fails if a required option is missing.
     """
     # Act
-    result = runner.invoke(app, ["contribute", "pattern", "--name", "Incomplete Pattern"])
+    result = worker.invoke(["contribute", "pattern", "--name", "Incomplete Pattern"])
 
     # Assert
     assert result.exit_code != 0
     assert "Missing option '--pattern'" in result.stderr
 
 
-@patch('whisper.cli.requests.get')
-def test_models_list_api_error(mock_requests_get):
+def test_models_list_api_error(ollama_api, worker):
     """
     Verify the `models list` command handles a 500 error from the Ollama API.
     """
     # Arrange
-    mock_response = MagicMock()
-    mock_response.raise_for_status.side_effect = requests.exceptions.HTTPError("500 Server Error", response=mock_response)
-    mock_response.status_code = 500
-    mock_requests_get.return_value = mock_response
+    ollama_api.tags = fake_response(error=requests.exceptions.HTTPError("500 Server Error"))
 
     # Act
-    result = runner.invoke(app, ["models", "list"])
+    result = worker.invoke(["models", "list"])
 
     # Assert
     assert result.exit_code != 0
@@ -640,60 +764,56 @@ def test_models_list_api_error(mock_requests_get):
     assert "500 Server Error" in result.stdout
 
 
-@patch('whisper.cli.FileScanner')
-def test_scan_command_exclude_option(mock_file_scanner):
+def test_scan_command_exclude_option(cli_mocks, worker):
     """
     Verify the scan command correctly passes the exclude option to the config.
     """
     # Arrange
-    mock_scanner_instance = mock_file_scanner.return_value
-    mock_scanner_instance.scan.return_value = []
+    mock_scanner_instance = cli_mocks.FileScanner.return_value
+    mock_scanner_instance.iter_scan.return_value = []
 
     # Act
-    result = runner.invoke(app, ["scan", ".", "--exclude", "test.txt", "--exclude", "**/temp/*"])
+    result = worker.invoke(["scan", ".", "--exclude", "test.txt", "--exclude", "**/temp/*"])
 
     # Assert
     assert result.exit_code == 0
 
     # Verify that FileScanner was called with the config.
-    call_args = mock_file_scanner.call_args
+    call_args = cli_mocks.FileScanner.call_args
     passed_config = call_args[1].get('config')
     assert "test.txt" in passed_config["rules"]["excluded_paths"]
     assert "**/temp/*" in passed_config["rules"]["excluded_paths"]
 
 
-@patch('whisper.cli.FileScanner')
-def test_scan_command_max_file_size_units(mock_file_scanner):
+@pytest.mark.parametrize("args,use_processes", [([], True), (["--threads"], False)])
+def test_scan_command_threads_option(args, use_processes, cli_mocks, worker):
+    """
+    Verify the scan command uses worker processes unless --threads is given.
+    """
+    # Act
+    result = worker.invoke(["scan", "."] + args)
+
+    # Assert
+    assert result.exit_code == 0
+    assert cli_mocks.FileScanner.call_args[1].get('use_processes') is use_processes
+
+
+@pytest.mark.parametrize("size", ["10KB", "2MB", "1GB"])
+def test_scan_command_max_file_size_units(size, cli_mocks, worker):
     """
     Verify the scan command correctly parses max file size with different units (KB, MB, GB).
     """
     # Arrange
-    mock_scanner_instance = mock_file_scanner.return_value
-    mock_scanner_instance.scan.return_value = []
-
-    # Act & Assert (KB)
-    result_kb = runner.invoke(app, ["scan", ".", "--max-file-size", "10KB"])
-    assert result_kb.exit_code == 0
-    call_args_kb = mock_file_scanner.call_args
-    passed_config_kb = call_args_kb[1].get('config')
-    assert passed_config_kb["rules"]["max_file_size"] == "10KB"
-    mock_file_scanner.reset_mock()
-
-    # Act & Assert (MB)
-    result_mb = runner.invoke(app, ["scan", ".", "--max-file-size", "2MB"])
-    assert result_mb.exit_code == 0
-    call_args_mb = mock_file_scanner.call_args
-    passed_config_mb = call_args_mb[1].get('config')
-    assert passed_config_mb["rules"]["max_file_size"] == "2MB"
-    mock_file_scanner.reset_mock()
-
-    # Act & Assert (GB)
-    result_gb = runner.invoke(app, ["scan", ".", "--max-file-size", "1GB"])
-    assert result_gb.exit_code == 0
-    call_args_gb = mock_file_scanner.call_args
-    passed_config_gb = call_args_gb[1].get('config')
-    assert passed_config_gb["rules"]["max_file_size"] == "1GB"
-    mock_file_scanner.reset_mock()
+    mock_scanner_instance = cli_mocks.FileScanner.return_value
+    mock_scanner_instance.iter_scan.return_value = []
+
+    # Act
+    result = worker.invoke(["scan", ".", "--max-file-size", size])
+
+    # Assert
+    assert result.exit_code == 0
+    passed_config = cli_mocks.FileScanner.call_args[1].get('config')
+    assert passed_config["rules"]["max_file_size"] == size
 
 
 @patch('whisper.cli.report_app')
@@ -702,4 +822,69 @@ def test_report_app_callback(mock_report_app):
     Verify the `report` command group's callback is correctly configured.
     """
     # This test primarily ensures that the `report_app` is correctly set up as a Typer app.
-    assert mock_report_app is not None
\ No newline at end of file
+    assert mock_report_app is not None
+
+def test_importing_cli_defers_heavy_imports():
+    """
+    Verify importing the CLI doesn't load the scanner, network or YAML stacks until a command needs them.
+    """
+    deferred = ["requests", "yaml", "rich.console", "rich.progress", "rich.table", "whisper.core.scanner", "whisper.config.settings"]
+    code = f"import sys, whisper.cli; print([m for m in {deferred!r} if m in sys.modules])"
+
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+
+    assert result.stdout.strip() == "[]"
+
+
+def test_command_help_leaves_logging_unconfigured():
+    """
+    Verify showing a command's help doesn't set up logging or import rich's logging handler.
+    """
+    code = (
+        "import logging, sys\n"
+        "from whisper.cli import app\n"
+        "try:\n"
+        "    app(['--verbose', 'scan', '--help'])\n"
+        "except SystemExit:\n"
+        "    pass\n"
+        "print('rich.logging' in sys.modules, logging.root.handlers == [])\n"
+    )
+
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+
+    assert result.stdout.split()[-2:] == ["False", "True"]
+
+
+@pytest.mark.parametrize("args,cache_enabled", [([], True), (["--no-ai-cache"], False)])
+def test_scan_command_no_ai_cache_option(args, cache_enabled, cli_mocks, worker):
+    """
+    Verify --no-ai-cache turns off the AI response cache in the scanner's config.
+    """
+    result = worker.invoke(["scan", "."] + args)
+
+    assert result.exit_code == 0
+    assert cli_mocks.FileScanner.call_args[1]["config"]["ai"]["cache"] is cache_enabled
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_scan_command_json_output_is_written_verbatim(use_orjson, cli_mocks, worker, monkeypatch):
+    """
+    Verify streamed JSON output matches serializing the whole list at once, unaltered by
+    console markup or wrapping, and is byte-for-byte the same with or without orjson.
+    """
+    if not use_orjson:
+        monkeypatch.setitem(sys.modules, "orjson", None)
+    elif importlib.util.find_spec("orjson") is None:
+        pytest.skip("orjson is not installed")
+    findings = [
+        dict(MOCK_FINDINGS[0], secret_value="[bold]" + "k" * 200 + "[/bold]", reason="naïve [red]"),
+        dict(MOCK_FINDINGS[0], line=11, reason="spans\nlines"),
+        dict(MOCK_FINDINGS[0], file="données/clé.env", secret_value="pässwörd-秘密"),
+        MOCK_FINDINGS[0],
+    ]
+    cli_mocks.FileScanner.return_value.iter_scan.return_value = iter(findings)
+
+    result = worker.invoke(["scan", ".", "--format", "json"])
+
+    assert result.exit_code == 0
+    assert result.stdout_bytes == (json.dumps(findings, indent=2, ensure_ascii=False) + "\n").encode("utf-8")
@@ -3,12 +3,18 @@ import pytest
 
 from whisper.core.detectors.discord_webhook_detector import DiscordWebhookDetector
 
-def test_discord_webhook_detector_finds_webhook():
+
+@pytest.fixture(scope="module")
+def detector():
+    """A single detector instance shared by every test in this module."""
+    return DiscordWebhookDetector()
+
+
+def test_discord_webhook_detector_finds_webhook(detector):
     """
     Verify the detector finds a standard Discord webhook URL.
     """
     content = 'const webhook_url = "https://discord.com/api/webhooks/1234567890/abcdefghijklmnopqrstuvwxyz";'
-    detector = DiscordWebhookDetector()
 
     findings = list(detector.detect(content))
 
@@ -19,13 +25,35 @@ def test_discord_webhook_detector_finds_webhook():
     assert finding[3] == "Discord Webhook URL"
 
 
-def test_discord_webhook_detector_ignores_invalid_webhook():
+@pytest.mark.parametrize(
+    "content,expected",
+    [
+        ('const webhook_url = "https://discord.com/api/webhooks/1234567890/abcdefghijklmnopqrstuvwxyz";', 1),
+        ('const canary_url = "https://canary.discord.com/api/webhooks/42/token-value";', 1),
+        ('const invalid_url = "https://example.com/api/webhooks/123/abc";', 0),
+        ('const not_numeric = "https://discord.com/api/webhooks/abc/def";', 0),
+    ],
+)
+def test_discord_webhook_detector_match_count(detector, content, expected):
+    """
+    Verify the detector only matches well-formed Discord webhook URLs.
+    """
+    assert len(list(detector.detect(content))) == expected
+
+
+def test_discord_webhook_detector_reports_line_and_host_variants(detector):
     """
-    Verify the detector ignores an invalid Discord webhook URL.
+    Verify the detector matches the ptb/discordapp hosts and reports the line number.
     """
-    content = 'const invalid_url = "https://example.com/api/webhooks/123/abc";'
-    detector = DiscordWebhookDetector()
+    content = (
+        "# webhooks\n"
+        'ptb = "https://ptb.discord.com/api/webhooks/1/abc_DEF-123"\n'
+        'legacy = "https://discordapp.com/api/webhooks/2/xyz"\n'
+    )
 
     findings = list(detector.detect(content))
 
-    assert len(findings) == 0
+    assert [(f[0], f[1]) for f in findings] == [
+        ("https://ptb.discord.com/api/webhooks/1/abc_DEF-123", 2),
+        ("https://discordapp.com/api/webhooks/2/xyz", 3),
+    ]
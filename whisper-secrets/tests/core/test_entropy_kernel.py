@@ -0,0 +1,65 @@
+import math
+
+import pytest
+
+from whisper.core.detectors import entropy_kernel
+from whisper.core.detectors.entropy_kernel import shannon_entropy, _shannon_entropy_py
+from whisper.core.detectors import entropy_detector
+from whisper.core.detectors.entropy_detector import EntropyDetector
+
+
+@pytest.mark.parametrize(
+    "data,expected",
+    [
+        (b"", 0.0),
+        (b"aaaa", 0.0),
+        (b"aaa", 0.0),
+        (b"aab", 0.9182958340544896),
+        (b"ab", 1.0),
+        (b"abcd", 2.0),
+        (bytes(range(256)), 8.0),
+    ],
+)
+def test_shannon_entropy_known_values(data, expected):
+    """
+    Verify the entropy kernel (JIT-compiled or not) returns the textbook values.
+    """
+    assert math.isclose(shannon_entropy(data), expected, abs_tol=1e-9)
+    assert math.isclose(_shannon_entropy_py(data), expected, abs_tol=1e-9)
+    if entropy_kernel.np is not None:
+        assert math.isclose(entropy_kernel._shannon_entropy_np(data), expected, abs_tol=1e-9)
+
+
+def test_entropy_detector_flags_high_entropy_string():
+    """
+    Verify the entropy detector reports a random-looking token but not a plain word run.
+    """
+    detector = EntropyDetector(threshold=4.0, min_length=20)
+    content = 'token = "AbcDefGhiJklMnoPqrStuVwxYz123456"\nname = "aaaaaaaaaaaaaaaaaaaaaaaa"\n'
+
+    findings = list(detector.detect(content))
+
+    assert [(f[0], f[1]) for f in findings] == [("AbcDefGhiJklMnoPqrStuVwxYz123456", 1)]
+
+
+@pytest.mark.parametrize("use_numpy", [True, False])
+def test_entropy_detector_tokenizes_like_word_regex(monkeypatch, use_numpy):
+    """
+    Verify the vectorized tokenizer, when available, finds the same tokens as the regex.
+    """
+    if use_numpy and entropy_detector.np is None:
+        pytest.skip("numpy is not installed")
+    if not use_numpy:
+        monkeypatch.setattr(entropy_detector, "np", None)
+
+    detector = EntropyDetector(threshold=0.0, min_length=5)
+    content = "café=Zx9Q/w2+Er 'short' \"quoted-token_1.2\"\nabcd\néabcdeé"
+
+    findings = list(detector.detect(content))
+
+    assert [(f[0], f[1]) for f in findings] == [
+        ("=Zx9Q/w2+Er", 1),
+        ("short", 1),
+        ("quoted-token_1.2", 1),
+        ("abcde", 3),
+    ]
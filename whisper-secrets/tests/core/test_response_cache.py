@@ -0,0 +1,96 @@
+import os
+import pickle
+import stat
+from unittest.mock import MagicMock, patch
+
+import requests
+
+from whisper.ai import ollama_client
+from whisper.ai.ollama_client import OllamaClient
+from whisper.ai.response_cache import ResponseCache, cache_key
+
+
+def test_response_cache_persists_verdicts_across_instances(tmp_path):
+    """
+    Verify a verdict stored by one cache is found by a new cache on the same file.
+    """
+    path = tmp_path / "cache" / "responses.sqlite3"
+    key = cache_key("model", "s3cr3t", "key = 's3cr3t'")
+    ResponseCache(path).set(key, {"is_secret": True, "reason": "looks real"})
+
+    assert ResponseCache(path).get(key) == {"is_secret": True, "reason": "looks real"}
+    assert ResponseCache(path).get(cache_key("other-model", "s3cr3t", "key = 's3cr3t'")) is None
+
+
+def test_response_cache_database_is_private_to_the_user(tmp_path):
+    """
+    Verify a new cache database, whose reasons can quote secrets, is only readable by its owner.
+    """
+    path = tmp_path / "cache" / "responses.sqlite3"
+    ResponseCache(path).set("key", {"is_secret": True, "reason": "quotes s3cr3t"})
+
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o600
+    assert stat.S_IMODE(os.stat(path.parent).st_mode) == 0o700
+
+
+def test_cache_key_depends_on_the_version():
+    """
+    Verify verdicts given for other prompts or generation options are stored under other keys.
+    """
+    assert cache_key("m", "s3cr3t", "ctx", "v1") != cache_key("m", "s3cr3t", "ctx", "v2")
+    assert cache_key("m", "s3cr3t", "ctx", "v1") == cache_key("m", "s3cr3t", "ctx", "v1")
+
+
+def test_ollama_client_asks_again_when_the_prompt_changes(tmp_path, monkeypatch):
+    """
+    Verify verdicts cached for an earlier prompt or generation options are not reused.
+    """
+    client = OllamaClient(model="m", host="http://ollama:11434", cache=ResponseCache(tmp_path / "c.sqlite3"))
+    answer = MagicMock()
+    answer.content = b'{"response": "{\\"is_secret\\": true, \\"reason\\": \\"real\\"}"}'
+
+    with patch.object(requests.Session, "post", return_value=answer) as post:
+        client.classify_candidate("s3cr3t", "ctx")
+        monkeypatch.setattr(ollama_client, "_CACHE_VERSION", "a-newer-prompt")
+        client.classify_candidate("s3cr3t", "ctx")
+        client.classify_candidates([("s3cr3t", "ctx")])
+
+    assert post.call_count == 2
+
+
+def test_response_cache_ignores_expired_verdicts(tmp_path):
+    """
+    Verify verdicts older than the TTL are not returned.
+    """
+    path = tmp_path / "responses.sqlite3"
+    with patch("whisper.ai.response_cache.time.time", return_value=1000.0):
+        ResponseCache(path, ttl=60).set("key", {"is_secret": False, "reason": "old"})
+
+    with patch("whisper.ai.response_cache.time.time", return_value=1061.0):
+        assert ResponseCache(path, ttl=60).get("key") is None
+
+
+def test_response_cache_can_be_pickled(tmp_path):
+    """
+    Verify a cache survives pickling, reopening its database when next used.
+    """
+    cache = ResponseCache(tmp_path / "responses.sqlite3")
+    cache.set("key", {"is_secret": True, "reason": "r"})
+
+    assert pickle.loads(pickle.dumps(cache)).get("key") == {"is_secret": True, "reason": "r"}
+
+
+def test_ollama_client_skips_the_model_for_cached_candidates(tmp_path):
+    """
+    Verify only successful answers are cached and later lookups skip the HTTP request.
+    """
+    client = OllamaClient(model="m", host="http://ollama:11434", cache=ResponseCache(tmp_path / "c.sqlite3"))
+    answer = MagicMock()
+    answer.content = b'{"response": "{\\"is_secret\\": true, \\"reason\\": \\"real\\"}"}'
+
+    with patch.object(requests.Session, "post", side_effect=requests.exceptions.ConnectionError("down")) as post:
+        assert client.classify_candidate("s3cr3t", "ctx")["is_secret"] is False
+    with patch.object(requests.Session, "post", return_value=answer) as post:
+        assert client.classify_candidate("s3cr3t", "ctx") == {"is_secret": True, "reason": "real"}
+        assert client.classify_candidate("s3cr3t", "ctx") == {"is_secret": True, "reason": "real"}
+    post.assert_called_once()
@@ -0,0 +1,90 @@
+import os
+from pathlib import Path
+
+import pytest
+
+from whisper.core.walk import iter_files
+
+
+def test_iter_files_yields_every_file_with_its_size(tmp_path: Path):
+    """
+    Verify the walk descends into subdirectories and reports file sizes.
+    """
+    (tmp_path / "a" / "b").mkdir(parents=True)
+    (tmp_path / "top.txt").write_text("12345")
+    (tmp_path / "a" / "b" / "deep.txt").write_text("")
+
+    assert sorted(iter_files(str(tmp_path))) == [
+        (str(tmp_path / "a" / "b" / "deep.txt"), 0),
+        (str(tmp_path / "top.txt"), 5),
+    ]
+
+
+@pytest.mark.skipif(not hasattr(os, "symlink") or os.name == "nt", reason="needs POSIX symlinks")
+def test_iter_files_does_not_follow_directory_symlinks(tmp_path: Path):
+    """
+    Verify a symlink loop is listed once and never walked into.
+    """
+    (tmp_path / "src").mkdir()
+    (tmp_path / "src" / "app.py").write_text("x")
+    os.symlink(tmp_path, tmp_path / "src" / "loop")
+
+    assert list(iter_files(str(tmp_path))) == [(str(tmp_path / "src" / "app.py"), 1)]
+
+
+def test_iter_files_does_not_stat_skipped_files(tmp_path: Path, monkeypatch):
+    """
+    Verify files the skip callback rejects are neither yielded nor stat'ed.
+    """
+    (tmp_path / "app.py").write_text("x")
+    (tmp_path / "app.log").write_text("x")
+    stat_calls = []
+    real_scandir = os.scandir
+
+    class RecordingEntry:
+        def __init__(self, entry):
+            self._entry = entry
+            self.path = entry.path
+
+        def is_dir(self, follow_symlinks=True):
+            return self._entry.is_dir(follow_symlinks=follow_symlinks)
+
+        def is_file(self):
+            return self._entry.is_file()
+
+        def stat(self):
+            stat_calls.append(self.path)
+            return self._entry.stat()
+
+    class RecordingScandir:
+        def __init__(self, path):
+            self._entries = real_scandir(path)
+
+        def __iter__(self):
+            return (RecordingEntry(entry) for entry in self._entries)
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc_info):
+            self._entries.close()
+
+    monkeypatch.setattr("whisper.core.walk.os.scandir", RecordingScandir)
+
+    assert list(iter_files(str(tmp_path), skip=lambda path: path.endswith(".log"))) == [
+        (str(tmp_path / "app.py"), 1)
+    ]
+    assert stat_calls == [str(tmp_path / "app.py")]
+
+
+def test_iter_files_does_not_walk_pruned_directories(tmp_path: Path):
+    """
+    Verify directories the prune callback rejects are skipped with everything inside them.
+    """
+    (tmp_path / "node_modules" / "left-pad").mkdir(parents=True)
+    (tmp_path / "node_modules" / "left-pad" / "index.js").write_text("x")
+    (tmp_path / "app.js").write_text("x")
+
+    files = iter_files(str(tmp_path), prune=lambda path: os.path.basename(path) == "node_modules")
+
+    assert list(files) == [(str(tmp_path / "app.js"), 1)]
@@ -1,9 +1,26 @@
-from typing import Dict, Any, Optional
+import functools
+from typing import Dict, Any, List, Optional
 
 from whisper.ai.ollama_client import OllamaClient
+from whisper.ai.prefilter import prejudge
+from whisper.ai.response_cache import ResponseCache
 from whisper.config.settings import load_config
 
 
+@functools.lru_cache(maxsize=8)
+def _get_ollama_client(model: str, host: Optional[str], concurrency: Optional[int], cache: bool) -> OllamaClient:
+    """
+    Returns the shared Ollama client for a set of settings, so classifiers built
+    with the same config reuse one client and its in-memory verdict cache.
+    """
+    return OllamaClient(
+        model=model,
+        host=host,
+        concurrency=concurrency,
+        cache=ResponseCache() if cache else None,
+    )
+
+
 class SecretClassifier:
     """
     Uses an AI client to classify if a given candidate is a secret.
@@ -24,14 +41,20 @@ class SecretClassifier:
         # This is where logic could be added to switch between different AI providers
         # (e.g., a cloud fallback). For now, it's hardcoded to Ollama.
         if ai_config.get("primary") == "ollama":
-            self.ai_client = OllamaClient(model=ai_config.get("model"))
+            self.ai_client = _get_ollama_client(
+                ai_config.get("model"),
+                ai_config.get("host"),
+                ai_config.get("concurrency"),
+                bool(ai_config.get("cache", True)),
+            )
         else:
             # In the future, this could raise an error or initialize a different client.
             raise ValueError(f"Unsupported AI provider: {ai_config.get('primary')}")
 
     def classify(self, candidate: str, context: str) -> Dict[str, Any]:
         """
-        Passes a candidate and its context to the configured AI client for analysis.
+        Passes a candidate and its context to the configured AI client for analysis,
+        unless the candidate is obviously a placeholder or a checksummed token.
 
         Args:
             candidate (str): The potential secret string to analyze.
@@ -41,4 +64,28 @@ class SecretClassifier:
             A dictionary containing the AI model's analysis, including whether
             it's a secret and the reasoning.
         """
-        return self.ai_client.classify_candidate(candidate, context)
\ No newline at end of file
+        verdict = prejudge(candidate)
+        if verdict is not None:
+            return verdict
+        return self.ai_client.classify_candidate(candidate, context)
+
+    def classify_batch(self, items: List[Dict[str, str]]) -> List[Dict[str, Any]]:
+        """
+        Classifies several candidates at once, letting the AI client run the
+        requests concurrently. Candidates `prejudge` can decide are never sent.
+
+        Args:
+            items (List[Dict[str, str]]): Dictionaries with "candidate" and "context" keys.
+
+        Returns:
+            A list of analysis dictionaries, in the same order as `items`.
+        """
+        results = [prejudge(item["candidate"]) for item in items]
+        undecided = [index for index, result in enumerate(results) if result is None]
+        if undecided:
+            answers = self.ai_client.classify_candidates(
+                [(items[index]["candidate"], items[index]["context"]) for index in undecided]
+            )
+            for index, answer in zip(undecided, answers):
+                results[index] = answer
+        return results
\ No newline at end of file
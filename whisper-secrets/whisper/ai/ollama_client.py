@@ -1,14 +1,176 @@
 import requests
+import functools
+import hashlib
 import json
 import os
-from typing import Dict, Any, Optional
+import textwrap
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional, Tuple
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from whisper.ai.response_cache import ResponseCache, cache_key
+
+# orjson is an optional dependency (`pip install whisper-secrets[fast]`). It parses
+# and serializes the request and response bodies several times faster than json.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Where Ollama listens unless OLLAMA_HOST says otherwise.
+DEFAULT_OLLAMA_HOST = "http://localhost:11434"
+# How many classification requests are sent to Ollama at once by default. Ollama
+# queues requests beyond its own OLLAMA_NUM_PARALLEL limit, so this only bounds our side.
+MAX_CONCURRENT_REQUESTS = 4
+# How many connections to one Ollama host are kept alive for reuse.
+_POOL_MAXSIZE = 32
+# The most characters of context sent with a candidate. Prompt processing time
+# grows with its length, and a minified file can put a whole bundle on one line.
+MAX_CONTEXT_CHARS = 2048
+# Generation settings sent with every request. The answer is a short JSON object,
+# so generation is capped well below a rambling reply. The context window fits a
+# group request's prompt, with MAX_CONTEXT_CHARS of even poorly tokenizing
+# (random-looking) context, plus the answers of _MAX_GROUP_SIZE candidates. It's
+# the same for every request, as Ollama reloads the model when it changes.
+# Greedy decoding makes verdicts repeatable, which the response cache relies on.
+_GENERATION_OPTIONS = {"num_predict": 96, "num_ctx": 4096, "temperature": 0.0, "top_k": 1}
+# The most candidates classified together in one request.
+_MAX_GROUP_SIZE = 8
+
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+
+@functools.lru_cache(maxsize=1)
+def _shared_session() -> requests.Session:
+    """
+    Returns the session every request to Ollama is sent with, so connections are
+    kept alive and reused across candidates, batches and clients instead of a new
+    TCP connection being opened for each request.
+    """
+    session = requests.Session()
+    # Connection failures are retried briefly; POSTs that reached the server aren't
+    adapter = HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=_POOL_MAXSIZE,
+        max_retries=Retry(total=2, backoff_factor=0.1),
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers["Connection"] = "keep-alive"
+    return session
+
+
+# The classification prompt, split around its {context} and {candidate} slots and
+# dedented once here, so building a prompt is a single join of five strings.
+# This prompt is crucial. It instructs the model to act as a security expert.
+# It asks for a JSON response with a boolean `is_secret` and a `reason`.
+_PROMPT_PREFIX, _PROMPT_MID, _PROMPT_SUFFIX = textwrap.dedent(
+    """\
+    You are an expert security analyst specializing in secret detection.
+    Your task is to determine if a given string is a hardcoded secret.
+    Analyze the following code snippet and the highlighted candidate string.
+
+    Code Context:
+    ```
+    {context}
+    ```
+
+    Candidate Secret: "{candidate}"
+
+    Is the candidate string a real, hardcoded secret, or is it a placeholder,
+    example, or test data? Provide your answer in JSON format with two keys:
+    "is_secret" (boolean) and "reason" (a brief explanation).
+    """
+).replace("{context}", "{candidate}").split("{candidate}")
+
+
+# The system message for classifying several candidates found in the same context
+# in one chat request, so the context is sent and processed once for all of them.
+_GROUP_PROMPT_PREFIX, _GROUP_PROMPT_SUFFIX = textwrap.dedent(
+    """\
+    You are an expert security analyst specializing in secret detection.
+    Your task is to determine which of several strings are hardcoded secrets.
+    All of them were found in the following code snippet.
+
+    Code Context:
+    ```
+    {context}
+    ```
+
+    The user sends a JSON list of candidate strings. For each candidate, decide
+    whether it is a real, hardcoded secret, or a placeholder, example, or test data.
+    Provide your answer in JSON format as {"results": [...]}, with one object per
+    candidate, in the same order, each with two keys: "is_secret" (boolean) and
+    "reason" (a brief explanation).
+    """
+).split("{context}")
+
+# Cached verdicts are only reused if they were given for the same prompts and
+# generation options; editing either changes this and retires the old verdicts.
+_CACHE_VERSION = hashlib.sha256(json.dumps([
+    _PROMPT_PREFIX, _PROMPT_MID, _PROMPT_SUFFIX,
+    _GROUP_PROMPT_PREFIX, _GROUP_PROMPT_SUFFIX,
+    _GENERATION_OPTIONS,
+], sort_keys=True).encode("utf-8")).hexdigest()[:16]
+
+
+def ollama_host() -> str:
+    """
+    Returns the Ollama base URL, without a trailing slash, from the OLLAMA_HOST
+    environment variable or DEFAULT_OLLAMA_HOST. The variable is read on every
+    call, so a changed environment is always honoured.
+    """
+    return os.environ.get("OLLAMA_HOST", DEFAULT_OLLAMA_HOST).rstrip("/")
+
+def _trim_context(context: str, candidate: str, limit: int = MAX_CONTEXT_CHARS) -> str:
+    """
+    Shortens the context to at most `limit` characters, keeping the window
+    centred on the candidate so the model still sees it and its surroundings.
+    """
+    if len(context) <= limit:
+        return context
+    position = context.find(candidate)
+    if position < 0:
+        return context[:limit]
+    start = max(0, min(position - (limit - len(candidate)) // 2, len(context) - limit))
+    return context[start:start + limit]
+
+
+def _dumps(obj: Any) -> bytes:
+    """Serializes an object to JSON bytes, with orjson when it's installed."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode("utf-8")
+
+
+def _loads(data: Any) -> Any:
+    """Parses JSON from bytes or str, with orjson when it's installed."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _max_tokens(text: str) -> int:
+    """
+    Returns an upper bound on the number of tokens a text takes: the byte-level
+    tokenizers Ollama's models use cover at least one byte with every token.
+    """
+    return len(text.encode("utf-8"))
+
 
 class OllamaClient:
     """
     A client to interact with a local Ollama instance for secret classification.
     """
 
-    def __init__(self, model: str, host: Optional[str] = None):
+    def __init__(
+        self,
+        model: str,
+        host: Optional[str] = None,
+        concurrency: Optional[int] = None,
+        cache: Optional[ResponseCache] = None,
+    ):
         """
         Initializes the OllamaClient.
 
@@ -16,35 +178,29 @@ class OllamaClient:
             model (str): The name of the model to use for classification.
             host (Optional[str]): The URL of the Ollama host. Defaults to the
                                   OLLAMA_HOST environment variable or "http://localhost:11434".
+            concurrency (Optional[int]): How many requests `classify_candidates` sends at
+                                         once. Defaults to MAX_CONCURRENT_REQUESTS, and
+                                         is capped at the number of pooled connections.
+            cache (Optional[ResponseCache]): Where to look up and store verdicts, so a
+                                             candidate seen in an earlier run isn't sent
+                                             to the model again. None disables caching.
         """
-        if host is None:
-            host = os.getenv("OLLAMA_HOST", "http://localhost:11434")
-
-        self.api_url = f"{host.rstrip('/')}/api/generate"
+        host = ollama_host() if host is None else host.rstrip("/")
+        self.api_url = f"{host}/api/generate"
+        self.chat_url = f"{host}/api/chat"
         self.model = model
+        # Ollama only speaks HTTP/1.1, one request per connection at a time. More
+        # concurrent requests than pooled connections would open connections that
+        # the pool then discards instead of keeping them alive for reuse.
+        self.concurrency = min(max(1, concurrency or MAX_CONCURRENT_REQUESTS), _POOL_MAXSIZE)
+        self.cache = cache
 
     def _build_prompt(self, candidate: str, context: str) -> str:
         """Constructs the prompt for the AI model."""
-        # This prompt is crucial. It instructs the model to act as a security expert.
-        # It asks for a JSON response with a boolean `is_secret` and a `reason`.
-        return f"""
-        You are an expert security analyst specializing in secret detection.
-        Your task is to determine if a given string is a hardcoded secret.
-        Analyze the following code snippet and the highlighted candidate string.
-
-        Code Context:
-        ```
-        {context}
-        ```
-
-        Candidate Secret: "{candidate}"
-
-        Is the candidate string a real, hardcoded secret, or is it a placeholder,
-        example, or test data? Provide your answer in JSON format with two keys:
-        "is_secret" (boolean) and "reason" (a brief explanation).
-        """
+        context = _trim_context(context, candidate)
+        return "".join((_PROMPT_PREFIX, context, _PROMPT_MID, candidate, _PROMPT_SUFFIX))
 
-    def classify_candidate(self, candidate: str, context: str) -> Dict[str, Any]:
+    def classify_candidate(self, candidate: str, context: str, session: Optional[requests.Session] = None) -> Dict[str, Any]:
         """
         Asks the Ollama model to classify if a candidate string is a secret
         based on its surrounding code context.
@@ -52,32 +208,159 @@ class OllamaClient:
         Args:
             candidate (str): The potential secret string.
             context (str): The surrounding code or file content.
+            session (Optional[requests.Session]): The session to send the request with.
+                                                  Defaults to the shared keep-alive session.
 
         Returns:
             A dictionary containing the model's analysis (e.g., {"is_secret": True, "reason": "..."}).
             Returns a default error dictionary if the request fails.
         """
+        key = None
+        if self.cache is not None:
+            key = cache_key(self.model, candidate, context, _CACHE_VERSION)
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+
         prompt = self._build_prompt(candidate, context)
         payload = {
             "model": self.model,
             "prompt": prompt,
             "stream": False,
             "format": "json",  # Ollama can directly output JSON
+            "options": _GENERATION_OPTIONS,
         }
 
         try:
-            response = requests.post(self.api_url, json=payload, timeout=30)
+            response = (session or _shared_session()).post(
+                self.api_url, data=_dumps(payload), headers=_JSON_HEADERS, timeout=30
+            )
             response.raise_for_status()  # Raise an exception for bad status codes (4xx or 5xx)
 
             # The model's JSON output is a string inside the 'response' key
-            response_data = response.json()
-            model_output = json.loads(response_data.get("response", "{}"))
+            response_data = _loads(response.content)
+            model_output = _loads(response_data.get("response") or "{}")
 
-            return {
+            result = {
                 "is_secret": model_output.get("is_secret", False),
                 "reason": model_output.get("reason", "Failed to parse model output."),
             }
         except requests.exceptions.RequestException as e:
             return {"is_secret": False, "reason": f"Ollama API request failed: {e}"}
         except json.JSONDecodeError:
-            return {"is_secret": False, "reason": "Failed to decode JSON response from model."}
\ No newline at end of file
+            return {"is_secret": False, "reason": "Failed to decode JSON response from model."}
+
+        # Only answers from the model are cached; failed requests are retried next time
+        if key is not None:
+            self.cache.set(key, result)
+        return result
+
+    def classify_candidates_in_context(
+        self, context: str, candidates: List[str], session: Optional[requests.Session] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Asks the Ollama model to classify several candidates found in the same
+        context with one chat request, which sends the context only once.
+        Falls back to one request per candidate if the context must be trimmed,
+        the prompt and answers might not fit the context window, or the model's
+        answer doesn't match the candidates.
+
+        Args:
+            context (str): The surrounding code or file content shared by the candidates.
+            candidates (List[str]): The potential secret strings.
+            session (Optional[requests.Session]): The session to send the request with.
+                                                  Defaults to the shared keep-alive session.
+
+        Returns:
+            A list of analysis dictionaries, in the same order as `candidates`.
+        """
+        if len(candidates) < 2 or len(context) > MAX_CONTEXT_CHARS:
+            return [self.classify_candidate(candidate, context, session=session) for candidate in candidates]
+
+        system = "".join((_GROUP_PROMPT_PREFIX, context, _GROUP_PROMPT_SUFFIX))
+        user = _dumps(candidates).decode("utf-8")
+        # Room for every candidate's answer
+        num_predict = _GENERATION_OPTIONS["num_predict"] * len(candidates)
+        # Past the window, Ollama would shift the instructions out of the context
+        if _max_tokens(system) + _max_tokens(user) + num_predict > _GENERATION_OPTIONS["num_ctx"]:
+            return [self.classify_candidate(candidate, context, session=session) for candidate in candidates]
+
+        payload = {
+            "model": self.model,
+            "messages": [
+                {"role": "system", "content": system},
+                {"role": "user", "content": user},
+            ],
+            "stream": False,
+            "format": "json",
+            "options": dict(_GENERATION_OPTIONS, num_predict=num_predict),
+        }
+
+        try:
+            response = (session or _shared_session()).post(
+                self.chat_url, data=_dumps(payload), headers=_JSON_HEADERS, timeout=30
+            )
+            response.raise_for_status()
+            model_output = _loads(_loads(response.content).get("message", {}).get("content") or "{}")
+            answers = model_output.get("results") if isinstance(model_output, dict) else None
+        except requests.exceptions.RequestException as e:
+            return [{"is_secret": False, "reason": f"Ollama API request failed: {e}"} for _ in candidates]
+        except json.JSONDecodeError:
+            answers = None
+
+        if not isinstance(answers, list) or len(answers) != len(candidates) \
+                or not all(isinstance(answer, dict) for answer in answers):
+            return [self.classify_candidate(candidate, context, session=session) for candidate in candidates]
+
+        results = []
+        for candidate, answer in zip(candidates, answers):
+            result = {
+                "is_secret": answer.get("is_secret", False),
+                "reason": answer.get("reason", "Failed to parse model output."),
+            }
+            if self.cache is not None:
+                self.cache.set(cache_key(self.model, candidate, context, _CACHE_VERSION), result)
+            results.append(result)
+        return results
+
+    def classify_candidates(self, items: List[Tuple[str, str]]) -> List[Dict[str, Any]]:
+        """
+        Classifies several (candidate, context) pairs, sending up to
+        `concurrency` requests at a time over a pool of kept-alive connections.
+        Candidates that share a context are classified together, up to
+        _MAX_GROUP_SIZE per request.
+
+        Args:
+            items (List[Tuple[str, str]]): The (candidate, context) pairs to classify.
+
+        Returns:
+            A list of analysis dictionaries, in the same order as `items`.
+        """
+        if not items:
+            return []
+
+        results: List[Optional[Dict[str, Any]]] = [None] * len(items)
+        groups: Dict[str, List[int]] = {}
+        for index, (candidate, context) in enumerate(items):
+            cached = self.cache.get(cache_key(self.model, candidate, context, _CACHE_VERSION)) if self.cache is not None else None
+            if cached is not None:
+                results[index] = cached
+            else:
+                groups.setdefault(context, []).append(index)
+        chunks = [
+            indexes[start:start + _MAX_GROUP_SIZE]
+            for indexes in groups.values()
+            for start in range(0, len(indexes), _MAX_GROUP_SIZE)
+        ]
+
+        session = _shared_session()
+
+        def classify_group(indexes: List[int]) -> List[Dict[str, Any]]:
+            context = items[indexes[0]][1]
+            return self.classify_candidates_in_context(context, [items[i][0] for i in indexes], session=session)
+
+        with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+            for indexes, answers in zip(chunks, pool.map(classify_group, chunks)):
+                for index, answer in zip(indexes, answers):
+                    results[index] = answer
+        return results
\ No newline at end of file
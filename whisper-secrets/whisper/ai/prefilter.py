@@ -0,0 +1,79 @@
+import re
+import zlib
+from typing import Any, Dict, Optional
+
+# Values that are only ever stand-ins for a real secret. Compared lowercased.
+# The documented AWS example credentials are included, as they appear in a lot of code.
+_PLACEHOLDERS = frozenset({
+    "changeme",
+    "change_me",
+    "changeit",
+    "replaceme",
+    "replace_me",
+    "placeholder",
+    "redacted",
+    "dummy",
+    "example",
+    "sample",
+    "your_api_key",
+    "your-api-key",
+    "yourapikey",
+    "your_token",
+    "your_secret",
+    "akiaiosfodnn7example",
+    "wjalrxutnfemi/k7mdeng/bpxrficyexamplekey",
+})
+
+# Masked values and template variables, e.g. "xxxxxxxx", "********", "${API_KEY}",
+# "{{ api_key }}", "<your-token>" and "%(password)s".
+_PLACEHOLDER_SHAPE = re.compile(
+    r"(?:x+|\*+|\.+|-+|0+|\$\{[^}]*\}|\{\{.*\}\}|<[^<>]*>|%\([^)]*\)s)",
+    re.IGNORECASE | re.DOTALL,
+)
+
+# GitHub tokens: a type prefix, 30 random characters and the base62 CRC32 of those
+# 30 characters, so a token with a matching checksum is a real issued token shape.
+_GITHUB_TOKEN = re.compile(r"gh[pousr]_([A-Za-z0-9]{30})([A-Za-z0-9]{6})")
+_BASE62 = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz"
+
+
+def _base62(number: int, width: int) -> str:
+    """Encodes a non-negative number in base62, left-padded with zeros to `width`."""
+    digits = []
+    while number:
+        number, remainder = divmod(number, 62)
+        digits.append(_BASE62[remainder])
+    return "".join(reversed(digits)).rjust(width, "0")
+
+
+def _is_placeholder(candidate: str) -> bool:
+    """Checks if a candidate is an obvious placeholder rather than a secret."""
+    value = candidate.strip().strip("'\"")
+    return value.lower() in _PLACEHOLDERS or _PLACEHOLDER_SHAPE.fullmatch(value) is not None
+
+
+def _is_checksummed_github_token(candidate: str) -> bool:
+    """Checks if a candidate is a GitHub token whose embedded CRC32 checksum matches."""
+    match = _GITHUB_TOKEN.fullmatch(candidate)
+    if match is None:
+        return False
+    body, checksum = match.groups()
+    return _base62(zlib.crc32(body.encode("ascii")), 6) == checksum
+
+
+def prejudge(candidate: str) -> Optional[Dict[str, Any]]:
+    """
+    Classifies candidates whose verdict doesn't need the AI model: obvious
+    placeholders aren't secrets, and tokens with a valid built-in checksum are.
+
+    Args:
+        candidate (str): The potential secret string.
+
+    Returns:
+        An analysis dictionary like the AI client's, or None if the model should decide.
+    """
+    if _is_placeholder(candidate):
+        return {"is_secret": False, "reason": "Placeholder value, not a real secret."}
+    if _is_checksummed_github_token(candidate):
+        return {"is_secret": True, "reason": "GitHub token with a valid checksum."}
+    return None
@@ -0,0 +1,124 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+# How long a cached model verdict is reused before the model is asked again.
+DEFAULT_TTL_SECONDS = 7 * 24 * 60 * 60
+# How many verdicts are also kept in memory, sparing SQLite lookups within a scan.
+_MEMORY_ENTRIES = 4096
+
+
+def default_cache_path() -> Path:
+    """Returns the cache database path, under $XDG_CACHE_HOME or ~/.cache."""
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return Path(cache_home) / "whisper" / "ai-responses.sqlite3"
+
+
+def cache_key(model: str, candidate: str, context: str, version: str = "") -> str:
+    """
+    Builds the cache key for a model's verdict on a candidate in its context.
+
+    Args:
+        model (str): The model that gave the verdict.
+        candidate (str): The potential secret string.
+        context (str): The surrounding code the candidate was classified in.
+        version (str): Identifies how the model was asked, e.g. a hash of the
+                       prompts and generation options, so changing them stops
+                       older verdicts from being reused.
+    """
+    data = f"{model}\0{candidate}\0{context}\0{version}".encode("utf-8", errors="surrogatepass")
+    return hashlib.sha256(data).hexdigest()
+
+
+class ResponseCache:
+    """
+    A persistent cache of AI model verdicts, stored in SQLite, so re-scans skip
+    the model for candidates it has already classified.
+    """
+
+    def __init__(self, path: Optional[Path] = None, ttl: float = DEFAULT_TTL_SECONDS):
+        """
+        Initializes the cache. The database is only opened when first used.
+
+        Args:
+            path (Optional[Path]): The database file. Defaults to `default_cache_path()`.
+            ttl (float): How many seconds a verdict stays valid.
+        """
+        self.path = path
+        self.ttl = ttl
+        self._connection: Optional[sqlite3.Connection] = None
+        self._memory: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        # Classification runs in several threads, which share one connection
+        self._lock = threading.Lock()
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Connections and locks can't be pickled; a copy reopens the database on use
+        return {"path": self.path, "ttl": self.ttl}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__init__(**state)
+
+    def _connect(self) -> sqlite3.Connection:
+        """
+        Opens the database, creating it and dropping expired verdicts as needed.
+        A new database is only readable by the current user, since the stored
+        reasons can quote the secrets they were given.
+        """
+        if self._connection is None:
+            path = self.path or default_cache_path()
+            path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+            os.close(os.open(path, os.O_CREAT | os.O_WRONLY, 0o600))
+            connection = sqlite3.connect(str(path), check_same_thread=False)
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, created REAL, value TEXT)"
+            )
+            connection.execute("DELETE FROM responses WHERE created < ?", (time.time() - self.ttl,))
+            connection.commit()
+            self._connection = connection
+        return self._connection
+
+    def _remember(self, key: str, value: Dict[str, Any]) -> None:
+        """Keeps a verdict in memory, evicting the least recently used one if full."""
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+        if len(self._memory) > _MEMORY_ENTRIES:
+            self._memory.popitem(last=False)
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Returns the cached verdict for a key, or None if there is no valid one."""
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                return dict(self._memory[key])
+            try:
+                row = self._connect().execute(
+                    "SELECT value FROM responses WHERE key = ? AND created >= ?",
+                    (key, time.time() - self.ttl),
+                ).fetchone()
+            except (OSError, sqlite3.Error):
+                return None
+            if row is None:
+                return None
+            value = json.loads(row[0])
+            self._remember(key, value)
+            return dict(value)
+
+    def set(self, key: str, value: Dict[str, Any]) -> None:
+        """Stores a verdict. Failing to write the cache never fails classification."""
+        with self._lock:
+            self._remember(key, dict(value))
+            try:
+                connection = self._connect()
+                connection.execute(
+                    "INSERT OR REPLACE INTO responses (key, created, value) VALUES (?, ?, ?)",
+                    (key, time.time(), json.dumps(value)),
+                )
+                connection.commit()
+            except (OSError, sqlite3.Error):
+                pass
@@ -1,25 +1,16 @@
 import typer
 from pathlib import Path
-from typing import Optional, List
+from typing import TYPE_CHECKING, Any, Iterable, Optional, List, Tuple
 from enum import Enum
 import json
-import importlib.metadata
 import logging
-from rich.markup import escape
-from rich.console import Console
-from rich.table import Table
-from rich.filesize import decimal
-import subprocess
-import shutil
-import requests
-import tempfile
-from contextlib import contextmanager
-import yaml
+from bisect import bisect_right
+from contextlib import contextmanager, nullcontext
+import functools
 import os
-from rich.progress import Progress, SpinnerColumn, BarColumn, TextColumn
 
-from whisper.core.scanner import FileScanner
-from whisper.config.settings import load_config
+if TYPE_CHECKING:
+    from rich.console import Console
 
 class OutputFormat(str, Enum):
     table = "table"
@@ -30,7 +21,24 @@ app = typer.Typer(
     help="An AI-powered secret scanner to find real secrets without the noise.",
     add_completion=False,
 )
-console = Console()
+
+@functools.lru_cache(maxsize=1)
+def _get_console() -> "Console":
+    """Creates the shared rich Console on first use."""
+    from rich.console import Console
+    return Console()
+
+class _LazyConsole:
+    """
+    Stands in for the shared rich Console, creating it on first use, so that
+    `--version`, `--help` and other invocations that print nothing through
+    rich don't import it.
+    """
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(_get_console(), name)
+
+console = _LazyConsole()
 
 # Global flag for debug mode
 DEBUG = False
@@ -64,6 +72,8 @@ app.add_typer(contribute_app)
 def version_callback(value: bool):
     """Prints the version of the application."""
     if value:
+        import importlib.metadata
+
         try:
             version = importlib.metadata.version("whisper-secrets")
             typer.echo(f"Whisper version: {version}")
@@ -71,19 +81,77 @@ def version_callback(value: bool):
             typer.echo("Whisper version: (local development build)")
         raise typer.Exit()
 
-def find_config_file(start_path: Path) -> Optional[Path]:
+# The most output relayed from an `ollama` command per write.
+_RELAY_CHUNK_SIZE = 64 * 1024
+
+def _run_ollama(argv: List[str], *, stream: bool = False) -> int:
     """
-    Find the whisper.config.yaml file by traversing up the directory tree.
+    Runs an `ollama` command and returns its exit code.
+
+    With `stream=True` the command's output is relayed to stdout as it arrives,
+    in raw chunks with carriage returns intact, so progress lines the command
+    redraws in place are redrawn here too instead of each becoming a new line.
+    Otherwise the process is spawned directly with `os.posix_spawnp`,
+    inheriting the terminal, which avoids the pipe and fork overhead of Popen.
     """
-    current_path = start_path.resolve()
-    
-    while current_path != current_path.parent:  # Stop at root
-        config_file = current_path / "whisper.config.yaml"
-        if config_file.exists():
-            return config_file
-        current_path = current_path.parent
-    
-    return None
+    import subprocess
+    import sys
+
+    if not stream and hasattr(os, "posix_spawnp"):
+        pid = os.posix_spawnp(argv[0], argv, os.environ)
+        _, status = os.waitpid(pid, 0)
+        if os.WIFEXITED(status):
+            return os.WEXITSTATUS(status)
+        return -os.WTERMSIG(status)
+
+    process = subprocess.Popen(
+        argv,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+    )
+
+    if process.stdout:
+        sys.stdout.flush()
+        output = sys.stdout.buffer
+        # read1 returns whatever is already in the pipe, up to the chunk size,
+        # so a burst of progress updates costs one write and one flush
+        for chunk in iter(lambda: process.stdout.read1(_RELAY_CHUNK_SIZE), b""):
+            output.write(chunk)
+            output.flush()
+
+    process.wait()
+    return process.returncode
+
+def _stream_findings_json(findings: Iterable[dict]) -> int:
+    """
+    Writes findings to stdout as an indented JSON array, each as soon as it
+    arrives, and returns how many were written. The output is the same as
+    serializing the whole list at once.
+
+    Findings are serialized with orjson when it's installed (`pip install
+    whisper-secrets[fast]`), which is several times faster on the large finding
+    lists of big repositories. They're written as UTF-8 bytes straight to the
+    binary stdout: the console would read brackets in secrets as markup and wrap
+    long lines, corrupting the JSON. Like orjson, the fallback writes non-ASCII
+    characters as UTF-8 rather than escaping them, so both give the same bytes.
+    """
+    try:
+        import orjson
+    except ImportError:
+        orjson = None
+
+    count = 0
+    for finding in findings:
+        if orjson is not None:
+            data = orjson.dumps(finding, option=orjson.OPT_INDENT_2)
+        else:
+            data = json.dumps(finding, indent=2, ensure_ascii=False).encode("utf-8")
+        # Indented one level, as an array element. Newlines inside strings are
+        # escaped, so every raw newline is part of the layout.
+        typer.echo((b",\n  " if count else b"[\n  ") + data.replace(b"\n", b"\n  "), nl=False)
+        count += 1
+    typer.echo(b"\n]" if count else b"[]")
+    return count
 
 @app.callback()
 def main(
@@ -114,30 +182,59 @@ def main(
     ),
 ):
     """Whisper keeps your secrets silent."""
-    global DEBUG
+    global DEBUG, _log_settings
     DEBUG = debug
-    log_level = logging.DEBUG if verbose else logging.INFO
+    _log_settings = (logging.DEBUG if verbose else logging.INFO, log_file)
 
+# The log level and file chosen by the `main` callback. Commands set logging up
+# from them with `_configure_logging` when they start, so an invocation that only
+# shows a command's help never builds a handler or imports rich's logging.
+_log_settings: Optional[Tuple[int, Optional[Path]]] = None
+
+def _configure_logging() -> None:
+    """Sets up logging as requested by the `main` callback's options, if it ran."""
+    if _log_settings is None:
+        return
+    log_level, log_file = _log_settings
+    _setup_logging(log_level, log_file)
     if log_file:
-        # When logging to a file, use a detailed format.
-        logging.basicConfig(
-            level=log_level,
-            format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-            filename=str(log_file),
-            filemode='w',
-            force=True,  # This allows re-configuring the logger in tests
-        )
         console.log(f"Logging to file: [cyan]{log_file}[/cyan]")
+
+# The log file (or None, for the console) and handler set up by `_setup_logging`.
+_logging_setup: Optional[Tuple[Optional[Path], logging.Handler]] = None
+
+def _setup_logging(log_level: int, log_file: Optional[Path]) -> None:
+    """
+    Points the root logger at a log file, or at the console, at the given level.
+
+    The handler is kept for later invocations in the same process (tests,
+    shell completion): if they log to the same place and it is still installed,
+    only the level is updated instead of tearing down and rebuilding the handler.
+    """
+    global _logging_setup
+    if _logging_setup is not None:
+        destination, handler = _logging_setup
+        if destination == log_file and handler in logging.root.handlers:
+            logging.root.setLevel(log_level)
+            return
+
+    if log_file:
+        # When logging to a file, use a detailed format.
+        handler = logging.FileHandler(str(log_file), mode='w')
+        log_format, date_format = "%(asctime)s - %(name)s - %(levelname)s - %(message)s", None
     else:
         # Keep console output clean and use rich for formatting.
         from rich.logging import RichHandler
-        logging.basicConfig(
-            level=log_level,
-            format="%(message)s",
-            datefmt="[%X]",
-            handlers=[RichHandler(show_path=False)],
-            force=True,  # This allows re-configuring the logger in tests
-        )
+        handler = RichHandler(show_path=False)
+        log_format, date_format = "%(message)s", "[%X]"
+    logging.basicConfig(
+        level=log_level,
+        format=log_format,
+        datefmt=date_format,
+        handlers=[handler],
+        force=True,  # Replaces whatever was configured before, e.g. a previous log file
+    )
+    _logging_setup = (log_file, handler)
 
 EXIT_CODES = {
     0: "Success - No secrets found or operation completed successfully",
@@ -147,6 +244,18 @@ EXIT_CODES = {
     4: "Model not found",
 }
 
+def _max_file_size_callback(value: Optional[str]) -> Optional[str]:
+    """Checks --max-file-size up front, reading a bare number as megabytes."""
+    if value is None:
+        return None
+    from whisper.core.scanner import _SIZE_PATTERN
+
+    if value.isdigit():
+        value += "MB"
+    if _SIZE_PATTERN.fullmatch(value) is None:
+        raise typer.BadParameter(f"'{value}' is not a size like '10MB', '512KB' or '1G'.")
+    return value
+
 @app.command()
 def scan(
     path: Path = typer.Argument(
@@ -176,6 +285,7 @@ def scan(
         None,
         "--max-file-size",
         help="Override the maximum file size to scan (e.g., '10MB', '1G').",
+        callback=_max_file_size_callback,
     ),
 
     format: OutputFormat = typer.Option(
@@ -191,8 +301,28 @@ def scan(
         "--fail",
         help="Exit with a non-zero status code if any secrets are found.",
     ),
+    threads: bool = typer.Option(
+        False,
+        "--threads",
+        help="Scan files with a thread pool instead of worker processes (e.g. for network filesystems).",
+    ),
+    no_ai_cache: bool = typer.Option(
+        False,
+        "--no-ai-cache",
+        help="Ask the AI model about every candidate instead of reusing cached verdicts from earlier runs.",
+    ),
 ):
     """Scan a directory or file for secrets."""
+    import operator
+    from rich.progress import Progress, SpinnerColumn, BarColumn, TextColumn
+    from rich.console import Console
+    from rich.table import Table
+    from rich.text import Text
+    from whisper.config.settings import load_config
+    from whisper.core.scanner import FileScanner
+
+    _configure_logging()
+
     with _debug_exception_handler():
         # Load the base configuration
         config = load_config()            
@@ -203,50 +333,73 @@ def scan(
             logging.info(f"Overriding confidence threshold to: {confidence_threshold}")
 
         if exclude:
-            config["rules"]["excluded_paths"].extend(exclude)
+            # Repeated patterns would only make every file's exclusion check longer
+            excluded_paths = config["rules"]["excluded_paths"]
+            excluded_paths[:] = list(dict.fromkeys([*excluded_paths, *exclude]))
             logging.info(f"Adding exclusion patterns: {', '.join(exclude)}")
 
         if max_file_size:
-            value_to_set = max_file_size
-            if value_to_set.isdigit():
-                value_to_set += "MB"
+            config["rules"]["max_file_size"] = max_file_size
+            logging.info(f"Overriding max file size to: {max_file_size}")
 
-            config["rules"]["max_file_size"] = value_to_set
-            logging.info(f"Overriding max file size to: {value_to_set}")
+        if no_ai_cache:
+            config["ai"]["cache"] = False
+            logging.info("AI response cache disabled.")
         if format == OutputFormat.table:
             console.print(f"🔐 Scanning [cyan]{path}[/cyan]...")
 
-        with Progress(
+        streaming = format == OutputFormat.json
+        # JSON is written to stdout while the scan runs, so the bar moves to stderr
+        progress_console = Console(stderr=True) if streaming else _get_console()
+        # A bar piped into a file or CI log is never seen, so none is built there
+        progress_bar = Progress(
             SpinnerColumn(),
             TextColumn("[progress.description]{task.description}"),
             BarColumn(),
             TextColumn("[progress.percentage]{task.percentage:>3.0f}%"),
             TextColumn("({task.completed} of {task.total} files)"),
-            console=console,
+            console=progress_console,
+            redirect_stdout=not streaming,
             transient=True, # Hides the progress bar upon completion
-        ) as progress:
-            scanner = FileScanner(path, config=config)
-            findings = scanner.scan(progress=progress)
+        ) if progress_console.is_terminal else nullcontext()
+        with progress_bar as progress:
+            scanner = FileScanner(path, config=config, use_processes=not threads)
+            if streaming:
+                # Findings are written as they're classified, not held until the end
+                found = _stream_findings_json(scanner.iter_scan(progress=progress))
+            else:
+                findings = list(scanner.iter_scan(progress=progress))
+                found = len(findings)
+
+        unscanned = len(scanner.unscanned_files)
+        if unscanned:
+            # Kept off stdout in JSON mode, so the findings array stays valid
+            progress_console.print(
+                f"⚠️ {unscanned} file(s) could not be scanned and may hold secrets; see the log for details.",
+                style="bold yellow",
+            )
 
-        if not findings:
+        if not found:
             if format == OutputFormat.table:
                 console.print("✅ No secrets found.", style="green")
-            else:
-                console.print("[]") # Print an empty JSON array
+            if fail_on_finding and unscanned:
+                console.print("\n💥 Failing build due to files that could not be scanned.", style="bold red")
+                raise typer.Exit(code=1)
             # Don't exit here - let the command complete normally
             return
 
-        if format == OutputFormat.json:
-            console.print(json.dumps(findings, indent=2))
-        else: # Default to table
+        if format == OutputFormat.table:
             console.print(f"🚨 Found {len(findings)} potential secret(s):", style="bold red")
             table = Table(title="Scan Results")
             table.add_column("File", style="cyan")
             table.add_column("Line", style="magenta")
             table.add_column("Detector", style="green")
             table.add_column("Reason", style="yellow")
-            for finding in findings:
-                table.add_row(finding["file"], str(finding["line"]), finding["detector"], finding["reason"])
+            # Cells are plain Text, so rich doesn't parse every one of them as markup,
+            # and brackets in paths (e.g. "pages/[id].tsx") or reasons show as written
+            columns = operator.itemgetter("file", "line", "detector", "reason")
+            for file, line, detector, reason in map(columns, findings):
+                table.add_row(Text(file), Text(str(line)), Text(detector), Text(reason))
             console.print(table)
         
         if fail_on_finding:
@@ -265,6 +418,11 @@ def setup(
     """
     Download and set up the required AI model from Ollama.
     """
+    import shutil
+    from whisper.config.settings import load_config
+
+    _configure_logging()
+
     with _debug_exception_handler():
         config = load_config()
         # Use the provided model, or fall back to the one in the config
@@ -285,24 +443,12 @@ def setup(
         console.print("This will download the AI model from Ollama (may take a few minutes)...")
 
         try:
-            # Use Popen to stream the output in real-time
-            process = subprocess.Popen(
-                ["ollama", "pull", model_to_pull],
-                stdout=subprocess.PIPE,
-                stderr=subprocess.STDOUT,
-                text=True,
-                encoding='utf-8'
-            )
-
-            if process.stdout:
-                for line in iter(process.stdout.readline, ''):
-                    console.print(line.strip())
-
-            process.wait()
-            if process.returncode == 0:
+            # Stream the output in real-time so the download progress is visible
+            returncode = _run_ollama(["ollama", "pull", model_to_pull], stream=True)
+            if returncode == 0:
                 console.print(f"\n✅ Model [cyan]{model_to_pull}[/cyan] pulled successfully.", style="green")
             else:
-                console.print(f"\n[bold red]Error:[/bold red] Failed to pull model. Ollama exited with code {process.returncode}.", style="red")
+                console.print(f"\n[bold red]Error:[/bold red] Failed to pull model. Ollama exited with code {returncode}.", style="red")
                 raise typer.Exit(code=1)
         except FileNotFoundError:
             # This is a fallback for the shutil.which check
@@ -312,14 +458,34 @@ def setup(
             console.print(f"[bold red]An unexpected error occurred:[/bold red] {e}", style="red")
             raise typer.Exit(code=1)
 
+# Decimal (SI) size units, matching the output of `rich.filesize.decimal`.
+_SIZE_THRESHOLDS = tuple(1000 ** power for power in range(1, 9))
+_SIZE_SUFFIXES = ("kB", "MB", "GB", "TB", "PB", "EB", "ZB", "YB")
+
+def _format_size(size: int) -> str:
+    """Formats a byte count for display, e.g. 4109865159 -> '4.1 GB'."""
+    if size == 1:
+        return "1 byte"
+    if size < 1000:
+        return f"{size:,} bytes"
+    index = bisect_right(_SIZE_THRESHOLDS, size) - 1
+    return f"{size / _SIZE_THRESHOLDS[index]:,.1f} {_SIZE_SUFFIXES[index]}"
+
 @models_app.command("list")
 def list_models():
     """
     List all models available locally in your Ollama instance.
     """
+    import requests
+    from rich.table import Table
+
+    from whisper.ai.ollama_client import ollama_host
+
+    _configure_logging()
+
     with _debug_exception_handler():
-        host = os.getenv("OLLAMA_HOST", "http://localhost:11434")
-        api_url = f"{host.rstrip('/')}/api/tags"
+        host = ollama_host()
+        api_url = f"{host}/api/tags"
 
         try:
             response = requests.get(api_url, timeout=10)
@@ -344,12 +510,12 @@ def list_models():
         table.add_column("Size", style="magenta")
         table.add_column("Modified", style="yellow")
 
-        # Sort models by name
-        models.sort(key=lambda x: x.get("name", ""))
+        # Sort models by name without mutating the API response
+        models = sorted(models, key=lambda x: x.get("name", ""))
 
         for model in models:
             size_bytes = model.get("size", 0)
-            size_str = decimal(size_bytes)
+            size_str = _format_size(size_bytes)
             modified_at = model.get("modified_at", "N/A").split("T")[0]
             table.add_row(model.get("name"), size_str, modified_at)
 
@@ -365,6 +531,11 @@ def use_model(
     This updates the 'ai.model' key in your whisper.config.yaml file.
     If no config file is found, it will be created in the current directory.
     """
+    import yaml
+    from whisper.config.settings import YamlLoader, YamlDumper, find_config_file
+
+    _configure_logging()
+
     with _debug_exception_handler():
         config_path = find_config_file(Path.cwd())
 
@@ -376,7 +547,7 @@ def use_model(
         else:
             try:
                 with open(config_path, 'r') as f:
-                    config_data = yaml.safe_load(f) or {}
+                    config_data = yaml.load(f, Loader=YamlLoader) or {}
             except (IOError, yaml.YAMLError) as e:
                 console.print(f"[bold red]Error:[/bold red] Could not read or parse config file at [cyan]{config_path}[/cyan]. Error: {e}", style="red")
                 raise typer.Exit(code=1)
@@ -387,7 +558,7 @@ def use_model(
         # Write the updated config back to the file
         try:
             with open(config_path, 'w') as f:
-                yaml.dump(config_data, f, default_flow_style=False, sort_keys=False)
+                yaml.dump(config_data, f, Dumper=YamlDumper, default_flow_style=False, sort_keys=False)
             console.print(f"✅ Default model set to [cyan]{model_name}[/cyan] in [yellow]{config_path}[/yellow].")
         except IOError as e:
             console.print(f"[bold red]Error:[/bold red] Could not write to config file at [cyan]{config_path}[/cyan]. Error: {e}", style="red")
@@ -404,6 +575,9 @@ Your task is to determine if a given string is a hardcoded secret.
 When presented with a code snippet and a candidate string, you will respond ONLY in JSON format with two keys: "is_secret" (boolean) and "reason" (a brief explanation of your analysis).
 \"\"\"
 """
+# The template's bytes around {base_model}, so a Modelfile is built with one join
+# and written with a single os.write.
+_MODELFILE_PREFIX, _MODELFILE_SUFFIX = (part.encode("utf-8") for part in MODELFILE_TEMPLATE.split("{base_model}"))
 
 @models_app.command("create")
 def create_model(
@@ -413,6 +587,11 @@ def create_model(
     """
     Create a new custom model specialized for secret detection.
     """
+    import shutil
+    import tempfile
+
+    _configure_logging()
+
     with _debug_exception_handler():
         if not shutil.which("ollama"):
             console.print("[bold red]Error:[/bold red] `ollama` command not found.", style="red")
@@ -421,32 +600,24 @@ def create_model(
 
         console.print(f"🛠️  Creating new model [cyan]{name}[/cyan] from base model [cyan]{base_model}[/cyan]...")
 
-        modelfile_content = MODELFILE_TEMPLATE.format(base_model=base_model)
-
-        with tempfile.NamedTemporaryFile(mode='w', delete=False, suffix=".Modelfile") as temp_modelfile:
-            temp_modelfile.write(modelfile_content)
-            modelfile_path = temp_modelfile.name
-
+        fd, modelfile_path = tempfile.mkstemp(suffix=".Modelfile")
         try:
-            process = subprocess.Popen(
-                ["ollama", "create", name, "-f", modelfile_path],
-                stdout=subprocess.PIPE,
-                stderr=subprocess.STDOUT,
-                text=True,
-                encoding='utf-8'
-            )
-
-            if process.stdout:
-                for line in iter(process.stdout.readline, ''):
-                    console.print(line.strip())
+            os.write(fd, b"".join((_MODELFILE_PREFIX, base_model.encode("utf-8"), _MODELFILE_SUFFIX)))
+        finally:
+            os.close(fd)
 
-            process.wait()
-            if process.returncode == 0:
+        try:
+            returncode = _run_ollama(["ollama", "create", name, "-f", modelfile_path])
+            if returncode == 0:
                 console.print(f"\n✅ Model [cyan]{name}[/cyan] created successfully.", style="green")
                 console.print(f"To use it, run: [bold]whisper models use {name}[/bold]")
             else:
-                console.print(f"\n[bold red]Error:[/bold red] Failed to create model. Ollama exited with code {process.returncode}.", style="red")
+                console.print(f"\n[bold red]Error:[/bold red] Failed to create model. Ollama exited with code {returncode}.", style="red")
                 raise typer.Exit(code=1)
+        except FileNotFoundError:
+            # This is a fallback for the shutil.which check
+            console.print("[bold red]Error:[/bold red] `ollama` command not found.", style="red")
+            raise typer.Exit(code=1)
         finally:
             # Ensure the temporary Modelfile is always cleaned up
             os.remove(modelfile_path)
@@ -460,6 +631,8 @@ def update(
     """
     Download the latest security intelligence (e.g., updated rules and patterns).
     """
+    _configure_logging()
+
     # If a subcommand is called in the future, this main update logic shouldn't run.
     if ctx.invoked_subcommand is not None:
         return
@@ -499,6 +672,8 @@ def report_false_positive(
     """
     Report a false positive to help improve Whisper's accuracy.
     """
+    _configure_logging()
+
     with _debug_exception_handler():
         console.print("🙏 Thank you for your contribution!")
         console.print("Reporting false positive in", f"[cyan]{str(file)}[/cyan]", "at line", f"[magenta]{line}[/magenta].")
@@ -514,6 +689,10 @@ def contribute_pattern(
     """
     Suggest a new regex pattern to be included in Whisper's rules.
     """
+    from rich.markup import escape
+
+    _configure_logging()
+
     with _debug_exception_handler():
         console.print("🙏 Thank you for your contribution!")
         console.print(f"Suggesting new pattern: [cyan]{name}[/cyan]")
@@ -1,6 +1,38 @@
-import yaml
+import copy
+import functools
+import hashlib
+import json
+import os
+import tempfile
+from collections import OrderedDict
 from pathlib import Path
-from typing import Dict, Any, Optional
+from types import MappingProxyType
+from typing import Dict, Any, Mapping, Optional, Tuple
+
+
+@functools.lru_cache(maxsize=1)
+def _yaml_support() -> Tuple[Any, type, type]:
+    """
+    Imports PyYAML on first use, returning the module and its safe loader and
+    dumper. Config files served from the parsed-config cache never need it.
+    """
+    import yaml
+
+    # Prefer the libyaml-backed C implementations when PyYAML was built with them.
+    try:
+        from yaml import CSafeLoader as YamlLoader, CSafeDumper as YamlDumper
+    except ImportError:
+        from yaml import SafeLoader as YamlLoader, SafeDumper as YamlDumper
+    return yaml, YamlLoader, YamlDumper
+
+
+def __getattr__(name: str) -> Any:
+    # YamlLoader and YamlDumper stay importable from here without importing PyYAML up front
+    if name == "YamlLoader":
+        return _yaml_support()[1]
+    if name == "YamlDumper":
+        return _yaml_support()[2]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 # Define the default configuration settings for the application.
 # These values are used if they are not specified in the user's config file.
@@ -9,6 +41,10 @@ DEFAULT_CONFIG: Dict[str, Any] = {
         "primary": "ollama",
         "model": "whisper/secrets-detector:latest",
         "confidence_threshold": 0.8,
+        # How many classification requests are sent to the AI provider at once.
+        "concurrency": 4,
+        # Reuse verdicts from earlier runs, cached under ~/.cache/whisper.
+        "cache": True,
         "fallback": {
             "enabled": False,
         },
@@ -54,31 +90,158 @@ DEFAULT_CONFIG: Dict[str, Any] = {
     },
 }
 
+def _freeze(value: Any) -> Any:
+    """Recursively converts dicts and lists into read-only equivalents."""
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+def _thaw(value: Any) -> Any:
+    """Builds a fresh, mutable copy of a structure produced by `_freeze`."""
+    if isinstance(value, Mapping):
+        return {key: _thaw(item) for key, item in value.items()}
+    if isinstance(value, tuple):
+        return [_thaw(item) for item in value]
+    return value
+
+
+# A read-only snapshot of the defaults. Every call to load_config builds its
+# own mutable tree from it, so callers can never alter the defaults in place.
+_DEFAULTS_TEMPLATE = _freeze(DEFAULT_CONFIG)
+
+
 def deep_merge(source: Dict, destination: Dict) -> Dict:
     """
     Recursively merges source dict into destination dict.
+
+    Nested dicts are merged with an explicit stack rather than recursive calls.
+    A dict in source replaces a non-dict value at the same key in destination.
     """
-    for key, value in source.items():
-        if isinstance(value, dict):
-            node = destination.setdefault(key, {})
-            deep_merge(value, node)
-        else:
-            destination[key] = value
+    stack = [(source, destination)]
+    while stack:
+        source_node, destination_node = stack.pop()
+        for key, value in source_node.items():
+            if isinstance(value, dict):
+                node = destination_node.get(key)
+                if node is value:
+                    continue  # Merging a dict into itself changes nothing
+                if not isinstance(node, dict):
+                    node = destination_node[key] = {}
+                stack.append((value, node))
+            else:
+                destination_node[key] = value
     return destination
 
+# Parsed user config files, keyed by path and validated against the file's
+# modification time and size so edits on disk are always picked up.
+_CONFIG_CACHE: "OrderedDict[str, Tuple[int, int, Any]]" = OrderedDict()
+_CONFIG_CACHE_MAX_ENTRIES = 100
+
+# Set to any non-empty value to never read or write JSON copies of parsed
+# config files on disk; the in-process cache is still used.
+NO_CONFIG_CACHE_ENV_VAR = "WHISPER_NO_CONFIG_CACHE"
+
+
+def _parsed_copy_path(config_file_path: Path) -> Path:
+    """Returns where the JSON copy of a parsed config file is kept, under $XDG_CACHE_HOME or ~/.cache."""
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    name = hashlib.sha256(os.fsencode(config_file_path)).hexdigest()[:32]
+    return Path(cache_home) / "whisper" / "config" / f"{name}.json"
+
+
+def _load_parsed_copy(copy_path: Path, source: list) -> Optional[Dict[str, Any]]:
+    """Returns the JSON copy of a parsed config file, or None if there's none for this version of it."""
+    try:
+        with open(copy_path, "rb") as f:
+            entry = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(entry, dict) or entry.get("source") != source:
+        return None
+    return entry
+
+
+def _store_parsed_copy(copy_path: Path, source: list, parsed: Any) -> None:
+    """
+    Saves a parsed config file as JSON, tagged with the file's path, modification
+    time and size. Values JSON can't represent exactly, like dates or non-string
+    keys, aren't cached. The copy is readable by the current user only, since the
+    config may hold credentials. Failing to write it never fails loading the config.
+    """
+    try:
+        data = json.dumps({"source": source, "data": parsed})
+        if json.loads(data)["data"] != parsed:
+            return
+        copy_path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=copy_path.parent, suffix=".tmp")
+        try:
+            os.fchmod(fd, 0o600)
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(data)
+            os.replace(temp_path, copy_path)  # Readers never see a partial copy
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+    except (OSError, TypeError, ValueError):
+        pass
+
+
+def _read_config_file(config_file_path: Path) -> Any:
+    """
+    Parses a YAML config file, reusing a cached result if the file is unchanged.
+    A deep copy is returned so callers are free to mutate the result.
+
+    Besides the in-process cache, a JSON copy of the parsed file is kept in the
+    user's cache directory, so later runs load it with the json module instead
+    of importing PyYAML and parsing the file again. Setting the
+    WHISPER_NO_CONFIG_CACHE environment variable turns the JSON copy off.
+    """
+    stat = config_file_path.stat()
+    key = str(config_file_path)
+    entry = _CONFIG_CACHE.get(key)
+    if entry and entry[0] == stat.st_mtime_ns and entry[1] == stat.st_size:
+        _CONFIG_CACHE.move_to_end(key)
+        return copy.deepcopy(entry[2])
+
+    source = [key, stat.st_mtime_ns, stat.st_size]
+    use_parsed_copy = not os.environ.get(NO_CONFIG_CACHE_ENV_VAR)
+    copy_path = _parsed_copy_path(config_file_path)
+    parsed_copy = _load_parsed_copy(copy_path, source) if use_parsed_copy else None
+    if parsed_copy is not None:
+        parsed = parsed_copy.get("data")
+    else:
+        yaml, YamlLoader, _ = _yaml_support()
+        with open(config_file_path, "r") as f:
+            parsed = yaml.load(f, Loader=YamlLoader)
+        if use_parsed_copy:
+            _store_parsed_copy(copy_path, source, parsed)
+
+    _CONFIG_CACHE[key] = (stat.st_mtime_ns, stat.st_size, parsed)
+    _CONFIG_CACHE.move_to_end(key)
+    if len(_CONFIG_CACHE) > _CONFIG_CACHE_MAX_ENTRIES:
+        _CONFIG_CACHE.popitem(last=False)
+    return copy.deepcopy(parsed)
+
+
 def find_config_file(start_path: Path) -> Optional[Path]:
     """
     Search for whisper.config.yaml upwards from the start_path.
     This allows running the tool from any subdirectory of a project.
     """
-    current_path = start_path.resolve()
+    # Plain string paths keep the walk to one stat call per directory level,
+    # without building Path objects along the way
+    current_path = os.fspath(start_path.resolve())
     while True:
-        config_file = current_path / "whisper.config.yaml"
-        if config_file.is_file():
-            return config_file
-        if current_path.parent == current_path:  # Reached the filesystem root
+        config_file = os.path.join(current_path, "whisper.config.yaml")
+        if os.path.isfile(config_file):
+            return Path(config_file)
+        parent = os.path.dirname(current_path)
+        if parent == current_path:  # Reached the filesystem root
             return None
-        current_path = current_path.parent
+        current_path = parent
 
 
 def load_config() -> Dict[str, Any]:
@@ -86,16 +249,22 @@ def load_config() -> Dict[str, Any]:
     Loads configuration from whisper.config.yaml by searching up from the
     current directory, and merges it with the default configuration.
     """
-    config = DEFAULT_CONFIG.copy() # Start with a copy of the defaults
+    config = _thaw(_DEFAULTS_TEMPLATE) # Start with a fresh copy of the defaults
     config_file_path = find_config_file(Path.cwd())
 
     if config_file_path:
         try:
-            with open(config_file_path, "r") as f:
-                user_config = yaml.safe_load(f)
+            user_config = _read_config_file(config_file_path)
             if user_config:
                 config = deep_merge(user_config, config)
-        except (IOError, yaml.YAMLError) as e:
+        # The handler is only looked up once something was raised, so PyYAML
+        # is still only imported if a file needed parsing
+        except (IOError, _yaml_support()[0].YAMLError) as e:
             print(f"Warning: Could not load or parse {config_file_path}. Using default settings. Error: {e}")
 
     return config
+
+
+def clear_config_cache() -> None:
+    """Drops all cached config files, e.g. between tests or in long-running callers."""
+    _CONFIG_CACHE.clear()
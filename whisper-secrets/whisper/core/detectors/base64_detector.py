@@ -1,9 +1,26 @@
 import re
 import base64
 import math
-from collections import Counter
 from typing import Iterator, Tuple
 
+from whisper.core.detectors.entropy_kernel import shannon_entropy, warm_up
+from whisper.core.detectors.line_index import LineIndex
+
+
+def _max_decoded_entropy(candidate: str) -> float:
+    """
+    Returns an upper bound on the entropy of a Base64 string's decoded bytes,
+    computed from the encoded text, so candidates that can't reach the
+    threshold are ruled out without being decoded.
+
+    Each decoded byte is made from two adjacent characters at one of three
+    offsets within a 4-character group, so k distinct characters give at most
+    3 * k**2 distinct bytes. There are never more distinct bytes than decoded
+    bytes or byte values, and entropy is at most log2 of the distinct count.
+    """
+    distinct = len(set(candidate))
+    return math.log2(min(3 * distinct * distinct, len(candidate) * 3 // 4, 256))
+
 
 class Base64Detector:
     """
@@ -22,15 +39,12 @@ class Base64Detector:
         self.entropy_threshold = entropy_threshold
         # Regex to find potential Base64 strings inside quotes.
         self.b64_regex = re.compile(r"['\"]([A-Za-z0-9+/=]{%d,})['\"]" % self.min_length)
+        warm_up()
 
     @staticmethod
     def _shannon_entropy(data: bytes) -> float:
         """Calculates the Shannon entropy of a byte string."""
-        if not data:
-            return 0.0
-        byte_counts = Counter(data)
-        data_len = float(len(data))
-        return -sum(count / data_len * math.log2(count / data_len) for count in byte_counts.values())
+        return shannon_entropy(data)
 
     def detect(self, content: str) -> Iterator[Tuple[str, int, str, str]]:
         """
@@ -39,18 +53,26 @@ class Base64Detector:
         Yields:
             A tuple containing (candidate_value, line_number, line_content, detector_name).
         """
-        for line_num, line in enumerate(content.splitlines(), 1):
-            for match in self.b64_regex.finditer(line):
-                candidate = match.group(1)
-                # A valid Base64 string's length must be a multiple of 4.
-                if len(candidate) % 4 != 0:
-                    continue
-
-                try:
-                    decoded_data = base64.b64decode(candidate)
-                    entropy = self._shannon_entropy(decoded_data)
-                    if entropy >= self.entropy_threshold:
-                        yield candidate, line_num, line.strip(), "Base64"
-                except (base64.binascii.Error, ValueError):
-                    # Not a valid Base64 string, ignore it.
-                    continue
\ No newline at end of file
+        # No match can span a line break, so the whole content is searched at once
+        # and only the lines with a candidate are looked up.
+        lines = None
+        for match in self.b64_regex.finditer(content):
+            candidate = match.group(1)
+            # A valid Base64 string's length must be a multiple of 4.
+            if len(candidate) % 4 != 0:
+                continue
+            # Repetitive text can't decode to high-entropy data.
+            if _max_decoded_entropy(candidate) < self.entropy_threshold:
+                continue
+
+            try:
+                decoded_data = base64.b64decode(candidate)
+                entropy = self._shannon_entropy(decoded_data)
+                if entropy >= self.entropy_threshold:
+                    if lines is None:
+                        lines = LineIndex.of(content)
+                    line_num = lines.line_number(match.start())
+                    yield candidate, line_num, lines.line(line_num).strip(), "Base64"
+            except (base64.binascii.Error, ValueError):
+                # Not a valid Base64 string, ignore it.
+                continue
\ No newline at end of file
@@ -1,19 +1,22 @@
 # whisper/core/detectors/discord_webhook_detector.py
 import re
+from typing import Iterator, Optional, Tuple
+
+from whisper.core.detectors.line_index import LineIndex
+
+# Compiled once at import time and shared by every detector instance.
+_PATTERN = re.compile(
+    r"https://(?:ptb\.|canary\.)?discord(?:app)?\.com/api/webhooks/\d+/[A-Za-z0-9_-]+",
+    re.IGNORECASE,
+)
+
 
 class DiscordWebhookDetector:
     """
     Detects Discord webhook URLs in the provided content.
     """
 
-    def __init__(self):
-        # Define a regex pattern for Discord webhook URLs
-        self.pattern = re.compile(
-            r"https://(canary\.)?discord\.com/api/webhooks/\d+/[a-zA-Z0-9_-]+",
-            re.IGNORECASE,
-        )
-
-    def detect(self, content, file_path=None):
+    def detect(self, content: str, file_path: Optional[str] = None) -> Iterator[Tuple[str, int, str, str]]:
         """
         Detects Discord webhook URLs in the given content.
 
@@ -22,8 +25,11 @@ class DiscordWebhookDetector:
             file_path (str, optional): The path to the file being scanned. Defaults to None.
 
         Yields:
-            tuple: A tuple containing the matched secret, its type, and the detector's name.
+            Tuple of (matched_string, line_number, detector_name, reason)
         """
-        for match in self.pattern.finditer(content):
-            secret = match.group(0)
-            yield (secret, 0.8, "discord_webhook", "DiscordWebhookDetector", "Discord Webhook URL")
+        lines = None
+        for match in _PATTERN.finditer(content):
+            if lines is None:
+                lines = LineIndex.of(content)
+            line_num = lines.line_number(match.start())
+            yield (match.group(0), line_num, "DiscordWebhookDetector", "Discord Webhook URL")
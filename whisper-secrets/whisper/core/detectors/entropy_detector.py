@@ -1,8 +1,48 @@
-import math
+import functools
 import re
-from collections import Counter
+import string
 from typing import Iterator, Tuple
 
+from whisper.core.detectors.entropy_kernel import shannon_entropy, warm_up
+from whisper.core.detectors.line_index import LineIndex
+
+# NumPy is an optional dependency (`pip install whisper-secrets[fast]`). When it
+# is available candidate tokens are found with vectorized operations.
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# The characters common in keys, which candidate tokens are made of.
+_TOKEN_CHARS = string.ascii_letters + string.digits + "-_.+/="
+
+if np is not None:
+    _TOKEN_CHAR_TABLE = np.zeros(256, dtype=bool)
+    _TOKEN_CHAR_TABLE[[ord(c) for c in _TOKEN_CHARS]] = True
+
+
+@functools.lru_cache(maxsize=32)
+def _word_regex(min_length: int) -> re.Pattern:
+    """Compiles the candidate-token regex once per minimum length."""
+    return re.compile(r"['\"]?([a-zA-Z0-9-_.+/=]{%d,})['\"]?" % min_length)
+
+
+def _token_spans_vectorized(content: str, min_length: int) -> Iterator[Tuple[int, int]]:
+    """
+    Yields the (start, end) offsets of every maximal run of token characters at
+    least `min_length` long, the same tokens `_word_regex` finds.
+
+    Encoding to ASCII with replacement keeps one byte per character, and every
+    non-ASCII character becomes '?', which is never a token character.
+    """
+    data = np.frombuffer(content.encode("ascii", errors="replace"), dtype=np.uint8)
+    is_token = np.concatenate(([False], _TOKEN_CHAR_TABLE[data], [False]))
+    edges = np.diff(is_token.view(np.int8))
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1)
+    long_enough = (ends - starts) >= max(min_length, 1)
+    return zip(starts[long_enough].tolist(), ends[long_enough].tolist())
+
 
 class EntropyDetector:
     """
@@ -20,18 +60,17 @@ class EntropyDetector:
         self.threshold = threshold
         # This regex finds long words/strings containing characters common in keys.
         # It looks for strings that are at least `min_length` long.
-        self.word_regex = re.compile(r"['\"]?([a-zA-Z0-9-_.+/=]{%d,})['\"]?" % min_length)
+        self.word_regex = _word_regex(min_length)
+        self.min_length = min_length
+        warm_up()
 
     @staticmethod
     def _shannon_entropy(data: str) -> float:
-        """Calculates the Shannon entropy of a string."""
-        if not data:
-            return 0.0
-
-        char_counts = Counter(data)
-        data_len = float(len(data))
-
-        return -sum(count / data_len * math.log2(count / data_len) for count in char_counts.values())
+        """
+        Calculates the Shannon entropy of a string. Candidates are restricted to
+        ASCII by `word_regex`, so the entropy of their bytes is the same value.
+        """
+        return shannon_entropy(data.encode("utf-8"))
 
     def detect(self, content: str) -> Iterator[Tuple[str, int, str, str]]:
         """
@@ -40,11 +79,21 @@ class EntropyDetector:
         Yields:
             A tuple containing (candidate_value, line_number, line_content, detector_name).
         """
-        for line_num, line in enumerate(content.splitlines(), 1):
-            for match in self.word_regex.finditer(line):
-                # group(1) captures the string without potential surrounding quotes
-                candidate = match.group(1)
-                if candidate:
-                    entropy = self._shannon_entropy(candidate)
-                    if entropy >= self.threshold:
-                        yield candidate, line_num, line.strip(), "Entropy"
+        # Candidate tokens never contain line breaks, so the whole content is
+        # searched at once and only the lines with a finding are looked up.
+        lines = None
+        for start, end in self._token_spans(content):
+            candidate = content[start:end]
+            entropy = self._shannon_entropy(candidate)
+            if entropy >= self.threshold:
+                if lines is None:
+                    lines = LineIndex.of(content)
+                line_num = lines.line_number(start)
+                yield candidate, line_num, lines.line(line_num).strip(), "Entropy"
+
+    def _token_spans(self, content: str) -> Iterator[Tuple[int, int]]:
+        """Yields the (start, end) offsets of every candidate token in the content."""
+        if np is not None:
+            return _token_spans_vectorized(content, self.min_length)
+        # group(1) captures the string without potential surrounding quotes
+        return (match.span(1) for match in self.word_regex.finditer(content) if match.group(1))
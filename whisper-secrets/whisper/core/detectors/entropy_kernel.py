@@ -0,0 +1,74 @@
+import math
+from collections import Counter
+
+# NumPy and Numba are optional dependencies (`pip install whisper-secrets[fast]`).
+# With Numba the byte histogram and entropy sum are JIT-compiled to native code;
+# with NumPy alone, longer inputs are histogrammed and summed in vectorized form.
+try:
+    import numpy as np
+except ImportError:
+    np = None
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+# Below this many bytes, Counter costs less per call than NumPy's array setup.
+_NUMPY_MIN_LENGTH = 48
+
+
+def _shannon_entropy_py(data: bytes) -> float:
+    """Calculates the Shannon entropy of a byte string in pure Python."""
+    if not data:
+        return 0.0
+    # H = log2(N) - sum(c * log2(c)) / N, one log2 and no division per distinct byte.
+    # Rounding can leave a single repeated byte a hair below zero, hence the clamp.
+    data_len = len(data)
+    weighted = sum(count * math.log2(count) for count in Counter(data).values())
+    return max(0.0, math.log2(data_len) - weighted / data_len)
+
+
+def _shannon_entropy_np(data: bytes) -> float:
+    """Calculates the Shannon entropy of a byte string with NumPy."""
+    if not data:
+        return 0.0
+    counts = np.bincount(np.frombuffer(data, dtype=np.uint8), minlength=256)
+    probabilities = counts[counts > 0] / len(data)
+    return float(-(probabilities * np.log2(probabilities)).sum())
+
+
+if njit is not None:
+
+    @njit(cache=True, fastmath=True)
+    def _shannon_entropy_jit(data):
+        counts = np.zeros(256, dtype=np.int64)
+        for byte in data:
+            counts[byte] += 1
+        data_len = data.shape[0]
+        entropy = 0.0
+        for count in counts:
+            if count:
+                probability = count / data_len
+                entropy -= probability * np.log2(probability)
+        return entropy
+
+    def shannon_entropy(data: bytes) -> float:
+        """Calculates the Shannon entropy of a byte string."""
+        if not data:
+            return 0.0
+        return _shannon_entropy_jit(np.frombuffer(data, dtype=np.uint8))
+
+    def warm_up() -> None:
+        """Triggers JIT compilation so the first scanned file doesn't pay for it."""
+        shannon_entropy(b"warm-up")
+
+else:
+
+    def shannon_entropy(data: bytes) -> float:
+        """Calculates the Shannon entropy of a byte string."""
+        if np is not None and len(data) >= _NUMPY_MIN_LENGTH:
+            return _shannon_entropy_np(data)
+        return _shannon_entropy_py(data)
+
+    def warm_up() -> None:
+        """Nothing to compile without Numba."""
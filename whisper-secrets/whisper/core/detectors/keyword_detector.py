@@ -1,5 +1,44 @@
+import functools
 import re
-from typing import Iterator, Tuple, List
+from typing import Iterator, Optional, Tuple, List
+
+from whisper.core.detectors.line_index import LineIndex
+
+# pyahocorasick is an optional dependency (`pip install whisper-secrets[fast]`).
+# It finds every keyword in a single pass over the text, however many there are.
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+# Up to this many keywords, checking each one with a substring search rules out
+# files without any of them faster than a full scan does.
+_MAX_PREFILTER_KEYWORDS = 16
+
+
+@functools.lru_cache(maxsize=64)
+def _compile_keywords(keywords: Tuple[str, ...]) -> Optional[re.Pattern]:
+    """Compiles the combined keyword pattern once per keyword list."""
+    if not keywords:
+        return None
+    pattern_str = r'(' + '|'.join(re.escape(k) for k in keywords) + r')'
+    return re.compile(pattern_str, re.IGNORECASE)
+
+
+@functools.lru_cache(maxsize=64)
+def _build_automaton(keywords: Tuple[str, ...]):
+    """
+    Builds a case-insensitive Aho-Corasick automaton once per keyword list.
+    Each keyword maps to (priority, length), its priority being its position
+    in the list, as the regex alternation tries keywords in that order.
+    """
+    automaton = ahocorasick.Automaton()
+    for priority, keyword in enumerate(keywords):
+        lowered = keyword.lower()
+        if lowered not in automaton:
+            automaton.add_word(lowered, (priority, len(lowered)))
+    automaton.make_automaton()
+    return automaton
 
 
 class KeywordDetector:
@@ -17,11 +56,47 @@ class KeywordDetector:
         # For efficiency, we compile a single regex that looks for any of the keywords
         # as whole words (using word boundaries \b) and is case-insensitive.
         # re.escape handles any special characters in the keywords.
-        if keywords:
-            pattern_str = r'(' + '|'.join(re.escape(k) for k in keywords) + r')'
-            self.pattern = re.compile(pattern_str, re.IGNORECASE)
-        else:
-            self.pattern = None
+        # Keywords spanning a line break could never match a single line, so they're dropped.
+        keywords = [k for k in (keywords or ()) if k and k.splitlines() == [k]]
+        self.pattern = _compile_keywords(tuple(keywords))
+        # The automaton and the prefilter match on lowercased text, which only agrees
+        # with the regex's case-insensitive matching when keywords and content are
+        # all ASCII; otherwise, e.g. "ſ" matching "s", the regex is used.
+        ascii_keywords = all(k.isascii() for k in keywords)
+        # When available, an Aho-Corasick automaton replaces the regex for matching.
+        self.automaton = _build_automaton(tuple(keywords)) if ahocorasick and keywords and ascii_keywords else None
+        self._substrings = None
+        if len(keywords) <= _MAX_PREFILTER_KEYWORDS and ascii_keywords:
+            self._substrings = tuple(dict.fromkeys(k.lower() for k in keywords))
+
+    def _find(self, content: str) -> Iterator[Tuple[int, str]]:
+        """Yields (offset, keyword) for every keyword occurrence, as written in the content."""
+        lowered = None
+        if self._substrings is not None and content.isascii():
+            lowered = content.lower()
+            if not any(keyword in lowered for keyword in self._substrings):
+                return
+
+        if self.automaton is not None and content.isascii():
+            if lowered is None:
+                lowered = content.lower()
+            # The automaton reports every occurrence, overlapping ones included. The
+            # regex's matches are picked from them as finditer would: the leftmost
+            # start first, the earliest keyword in the list at that start, and
+            # scanning resumes after it.
+            matches = sorted(
+                (end_index - length + 1, priority, length)
+                for end_index, (priority, length) in self.automaton.iter(lowered)
+            )
+            position = 0
+            for start, _, length in matches:
+                if start >= position:
+                    yield start, content[start:start + length]
+                    position = start + length
+            return
+
+        for match in self.pattern.finditer(content):
+            yield match.start(), match.group(0)
 
     def detect(self, content: str) -> Iterator[Tuple[str, int, str, str]]:
         """
@@ -33,6 +108,11 @@ class KeywordDetector:
         if not self.pattern:
             return
 
-        for line_num, line in enumerate(content.splitlines(), 1):
-            for match in self.pattern.finditer(line):
-                yield match.group(0), line_num, line.strip(), "Keyword"
+        # Keywords never span lines, so the whole content is searched at once and
+        # only the lines with a match are looked up.
+        lines = None
+        for offset, keyword in self._find(content):
+            if lines is None:
+                lines = LineIndex.of(content)
+            line_num = lines.line_number(offset)
+            yield keyword, line_num, lines.line(line_num).strip(), "Keyword"
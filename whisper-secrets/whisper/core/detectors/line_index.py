@@ -0,0 +1,56 @@
+import re
+from array import array
+from bisect import bisect_right
+
+# The line boundaries recognised by str.splitlines(), so line numbers match the
+# ones detectors report when iterating over `content.splitlines()`.
+_LINE_BREAK = re.compile("\r\n|[\n\r\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029]")
+
+# The index built last, which `LineIndex.of` hands out again while detectors
+# scan the same content. Only one is kept, holding on to a single file's text.
+_last_index = None
+
+
+class LineIndex:
+    """
+    Maps offsets in a text to line numbers and line contents, so detectors can
+    match over the whole text instead of splitting it into one string per line.
+    """
+
+    def __init__(self, content: str):
+        """
+        Records where every line of the content starts and ends.
+
+        Args:
+            content (str): The text to index.
+        """
+        self.content = content
+        self._starts = array("q", [0])
+        self._ends = array("q")
+        for match in _LINE_BREAK.finditer(content):
+            self._ends.append(match.start())
+            self._starts.append(match.end())
+        self._ends.append(len(content))
+
+    @classmethod
+    def of(cls, content: str) -> "LineIndex":
+        """
+        Returns an index of the content, reusing the last one built if it was
+        for the same string, so the detectors run over a file share one index.
+
+        Args:
+            content (str): The text to index.
+        """
+        global _last_index
+        index = _last_index
+        if index is None or index.content is not content:
+            index = _last_index = cls(content)
+        return index
+
+    def line_number(self, offset: int) -> int:
+        """Returns the 1-based number of the line containing `offset`."""
+        return bisect_right(self._starts, offset)
+
+    def line(self, line_number: int) -> str:
+        """Returns the text of a 1-based line, without its line break."""
+        return self.content[self._starts[line_number - 1]:self._ends[line_number - 1]]
@@ -1,9 +1,137 @@
+import functools
 import re
 import logging
-from typing import Iterator, Tuple, List
+import threading
+from bisect import bisect_right
+from typing import Iterator, List, Optional, Set, Tuple
+
+# Hyperscan is an optional dependency (`pip install whisper-secrets[fast]`, Linux only).
+# It is used as a prefilter: one pass over the whole file finds the lines any rule
+# could match, and only those lines are run through `re`.
+try:
+    import hyperscan
+except ImportError:
+    hyperscan = None
+
+# The stdlib's regex parser, used to inspect rules' structure.
+try:
+    from re import _parser as sre_parse
+except ImportError:  # Python < 3.11
+    import sre_parse
 
 log = logging.getLogger(__name__)
 
+# Numbered backreferences change meaning once a rule is embedded in a larger
+# pattern, so rules containing one (or anything resembling one) are never combined.
+_NUMBERED_BACKREFERENCE = re.compile(r"\\(?:[1-9]|g<\d+>)")
+# Inline global flags such as (?i) would apply to every rule in a combined
+# pattern on Python < 3.11, so rules containing them are never combined either.
+_INLINE_GLOBAL_FLAGS = re.compile(r"\(\?[aiLmsux]+\)")
+# Hyperscan scans a whole file at once, where \A, \Z and \z only match at the
+# file's boundaries rather than each line's, so rules using them aren't prefiltered.
+_STRING_ANCHOR = re.compile(r"\\[AZz]")
+
+_REPEATS = (sre_parse.MAX_REPEAT, sre_parse.MIN_REPEAT)
+
+def _has_nested_quantifier(items, in_repeat: bool = False) -> bool:
+    r"""
+    Checks a parsed pattern for an unbounded repeat inside another unbounded
+    repeat, such as (a+)+ or (\w+\s?)*, the usual cause of catastrophic
+    backtracking. Possessive repeats and atomic groups never backtrack into
+    their contents, so they aren't looked into.
+    """
+    for op, av in items:
+        if op in _REPEATS:
+            unbounded = av[1] == sre_parse.MAXREPEAT
+            if unbounded and in_repeat:
+                return True
+            if _has_nested_quantifier(av[2], in_repeat or unbounded):
+                return True
+        elif op is sre_parse.SUBPATTERN:
+            if _has_nested_quantifier(av[-1], in_repeat):
+                return True
+        elif op is sre_parse.BRANCH:
+            if any(_has_nested_quantifier(branch, in_repeat) for branch in av[1]):
+                return True
+        elif op in (sre_parse.ASSERT, sre_parse.ASSERT_NOT):
+            if _has_nested_quantifier(av[1], in_repeat):
+                return True
+        elif op is sre_parse.GROUPREF_EXISTS:
+            if any(_has_nested_quantifier(branch, in_repeat) for branch in av[1:] if branch):
+                return True
+    return False
+
+@functools.lru_cache(maxsize=256)
+def _compile(rules: Tuple[str, ...]) -> Tuple[Tuple[re.Pattern, ...], Optional[re.Pattern]]:
+    """
+    Compiles a rule set once per process. Scanners built with the same rules,
+    e.g. one per worker or per test, share the compiled patterns.
+    """
+    patterns = []
+    for pattern_str in rules:
+        try:
+            patterns.append(re.compile(pattern_str))
+        except re.error as e:
+            log.warning("Skipping invalid regex pattern: '%s'. Error: %s", pattern_str, e)
+            continue
+        # The check over-approximates, e.g. ([a-z]+\.)+ is safe, so such rules are kept
+        if _has_nested_quantifier(sre_parse.parse(pattern_str)):
+            log.warning(
+                "Regex pattern '%s' nests unbounded repeats and may backtrack catastrophically "
+                "on long inputs; consider bounding the inner repeat, e.g. {1,64}.",
+                pattern_str,
+            )
+
+    return tuple(patterns), RegexDetector._combine(patterns)
+
+
+@functools.lru_cache(maxsize=256)
+def _hyperscan_database(rules: Tuple[str, ...]):
+    """
+    Compiles a rule set into a Hyperscan database once per process, or returns
+    None if Hyperscan isn't available or can't compile every rule.
+
+    Rules are compiled in prefilter mode, so the database may report lines that
+    `re` then rejects, but never misses a line `re` would match.
+    """
+    if hyperscan is None or not rules or any(_STRING_ANCHOR.search(rule) for rule in rules):
+        return None
+    flags = hyperscan.HS_FLAG_PREFILTER | hyperscan.HS_FLAG_MULTILINE | hyperscan.HS_FLAG_UTF8 | hyperscan.HS_FLAG_UCP
+    database = hyperscan.Database(mode=hyperscan.HS_MODE_BLOCK)
+    try:
+        database.compile(
+            expressions=[rule.encode("utf-8") for rule in rules],
+            ids=list(range(len(rules))),
+            elements=len(rules),
+            flags=[flags] * len(rules),
+        )
+    except hyperscan.error as e:
+        log.debug("Could not compile regex rules with Hyperscan, using re only. Error: %s", e)
+        return None
+    return database
+
+
+# Hyperscan needs a scratch space per concurrent scan, so each thread keeps its
+# own for every database it has scanned with.
+_scratch = threading.local()
+
+def _thread_scratch(database):
+    """Returns this thread's scratch space for a Hyperscan database."""
+    scratches = getattr(_scratch, "by_database", None)
+    if scratches is None:
+        scratches = _scratch.by_database = {}
+    scratch = scratches.get(database)
+    if scratch is None:
+        scratch = scratches[database] = hyperscan.Scratch(database)
+    return scratch
+
+
+def clear_cache() -> None:
+    """Drops all cached compiled rule sets."""
+    _compile.cache_clear()
+    _hyperscan_database.cache_clear()
+
+
 class RegexDetector:
     """
     A detector that uses a set of regex patterns to find potential secrets.
@@ -16,12 +144,57 @@ class RegexDetector:
         Args:
             rules (List[str]): A list of strings, where each string is a regex pattern.
         """
-        self.patterns = []
-        for pattern_str in rules:
-            try:
-                self.patterns.append(re.compile(pattern_str))
-            except re.error as e:
-                log.warning("Skipping invalid regex pattern: '%s'. Error: %s", pattern_str, e)
+        patterns, self._combined = _compile(tuple(rules))
+        self.patterns = list(patterns)
+
+    @staticmethod
+    def _combine(patterns: List[re.Pattern]) -> Optional[re.Pattern]:
+        """
+        Unions all patterns into a single alternation, used to skip lines no rule
+        matches with one search. Lines it does match are still scanned rule by rule,
+        since an alternation only reports one of several overlapping matches.
+
+        Returns None if the rules can't be combined, e.g. because they use numbered
+        backreferences, inline global flags or clashing group names.
+        """
+        if len(patterns) < 2 or any(
+            _NUMBERED_BACKREFERENCE.search(p.pattern) or _INLINE_GLOBAL_FLAGS.search(p.pattern)
+            for p in patterns
+        ):
+            return None
+        try:
+            return re.compile("|".join(f"(?:{p.pattern})" for p in patterns))
+        except re.error as e:
+            log.debug("Could not combine regex rules, scanning them one by one. Error: %s", e)
+            return None
+
+    @staticmethod
+    def _prefilter_lines(database, lines: List[str]) -> Set[int]:
+        """
+        Scans all lines in one Hyperscan pass and returns the indexes of the
+        lines where a rule may match.
+        """
+        data = "\n".join(lines).encode("utf-8", errors="replace")
+        line_ends = [match.start() for match in re.finditer(b"\n", data)]
+        hit_lines = set()
+
+        def on_match(rule_id, start, end, flags, context):
+            # `end` is exclusive, so the match's last byte decides its line
+            hit_lines.add(bisect_right(line_ends, end - 1))
+
+        database.scan(data, match_event_handler=on_match, scratch=_thread_scratch(database))
+        return hit_lines
+
+    def _detect_in_line(self, line: str) -> Iterator[str]:
+        """Yields the candidate of every rule match in a single line."""
+        if self._combined is not None and not self._combined.search(line):
+            return
+
+        for pattern in self.patterns:
+            for match in pattern.finditer(line):
+                candidate = match.groups()[-1] if match.groups() else match.group(0)
+                if candidate:
+                    yield candidate
 
     def detect(self, content: str) -> Iterator[Tuple[str, int, str, str]]:
         """
@@ -33,9 +206,19 @@ class RegexDetector:
         Yields:
             A tuple containing (candidate_value, line_number, line_content, detector_name).
         """
-        for line_num, line in enumerate(content.splitlines(), 1):
-            for pattern in self.patterns:
-                for match in pattern.finditer(line):
-                    candidate = match.groups()[-1] if match.groups() else match.group(0)
-                    if candidate:
-                        yield candidate, line_num, line.strip(), "Regex"
+        lines = content.splitlines()
+        # The database is looked up rather than stored on the detector, since it
+        # can't be pickled into the scanner's worker processes.
+        database = _hyperscan_database(tuple(p.pattern for p in self.patterns))
+        line_indexes = range(len(lines))
+        if database is not None:
+            try:
+                line_indexes = sorted(self._prefilter_lines(database, lines))
+            except hyperscan.error as e:
+                # Every line is still scanned with re, so the file's findings aren't lost
+                log.debug("Hyperscan prefilter failed, scanning every line. Error: %s", e)
+
+        for index in line_indexes:
+            line = lines[index]
+            for candidate in self._detect_in_line(line):
+                yield candidate, index + 1, line.strip(), "Regex"
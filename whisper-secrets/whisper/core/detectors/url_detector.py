@@ -1,6 +1,25 @@
+import functools
 import re
 from typing import Iterator, Tuple, List
 
+from whisper.core.detectors.line_index import LineIndex
+
+
+@functools.lru_cache(maxsize=32)
+def _compile_url_regex(protocols: Tuple[str, ...]) -> re.Pattern:
+    """Compiles the credentialed-URL regex once per protocol list."""
+    protocols_pattern = "|".join(re.escape(proto) for proto in protocols)
+
+    # Improved URL regex that captures the full URL including ports, paths, and query parameters
+    pattern = rf"""
+        (?:{protocols_pattern})        # Protocol
+        ://                           # Separator
+        (?:[^:@/\s]+:[^:@/\s]+@)      # username:password@
+        [^\s'"`,;]+                   # Rest of the URL (host, port, path, etc.)
+    """
+
+    return re.compile(pattern, re.VERBOSE | re.IGNORECASE)
+
 
 class UrlDetector:
     """
@@ -19,6 +38,7 @@ class UrlDetector:
             "http", "https", "ftp", "sftp", "ws", "wss",
             "postgres", "postgresql", "mysql", "redis", "mongodb"
         ]
+        self.regex = _compile_url_regex(tuple(self.protocols))
 
     def detect(self, content: str) -> Iterator[Tuple[str, int, str, str]]:
         """
@@ -27,20 +47,11 @@ class UrlDetector:
         Yields:
             Tuple of (matched_string, line_number, detector_name, reason)
         """
-        # Build regex pattern for the specified protocols
-        protocols_pattern = "|".join(re.escape(proto) for proto in self.protocols)
-        
-        # Improved URL regex that captures the full URL including ports, paths, and query parameters
-        pattern = rf"""
-            (?:{protocols_pattern})        # Protocol
-            ://                           # Separator
-            (?:[^:@/\s]+:[^:@/\s]+@)      # username:password@
-            [^\s'"`,;]+                   # Rest of the URL (host, port, path, etc.)
-        """
-        
-        regex = re.compile(pattern, re.VERBOSE | re.IGNORECASE)
-        
-        for line_num, line in enumerate(content.splitlines(), 1):
-            for match in regex.finditer(line):
-                url = match.group(0)
-                yield (url, line_num, "UrlDetector", "URL with Credentials")
\ No newline at end of file
+        # No match can span whitespace, so none spans a line break either: the whole
+        # content is searched at once and only the lines with a match are looked up.
+        lines = None
+        for match in self.regex.finditer(content):
+            if lines is None:
+                lines = LineIndex.of(content)
+            url = match.group(0)
+            yield (url, lines.line_number(match.start()), "UrlDetector", "URL with Credentials")
\ No newline at end of file
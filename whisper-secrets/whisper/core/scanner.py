@@ -1,44 +1,249 @@
-from pathlib import Path
-from typing import List, Dict, Any, Iterator, Tuple, Optional
-from rich.progress import Progress
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path, PurePath
+from typing import TYPE_CHECKING, List, Dict, Any, Iterator, Tuple, Optional
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from hashlib import blake2b
+import functools
 import importlib.metadata
+import logging
+import mmap
+import os
+import pickle
+import re
+import time
  
 from whisper.ai.classifier import SecretClassifier
 from whisper.config.settings import load_config
+from whisper.core.walk import iter_files
 
+log = logging.getLogger(__name__)
+
+if TYPE_CHECKING:
+    from rich.progress import Progress
+
+@functools.lru_cache(maxsize=1)
 def _load_detector_registry() -> Dict[str, Any]:
     """
     Dynamically discovers and loads all registered detector plugins.
+
+    Entry points are discovered once per process; call
+    `_load_detector_registry.cache_clear()` to pick up newly installed plugins.
     """
     registry = {}
     for entry_point in importlib.metadata.entry_points(group="whisper.detectors"):
         registry[entry_point.name] = entry_point.load()
     return registry
 
+# A size with a unit, e.g. '5MB', '512 kb', '1.5G' or '100B'.
+_SIZE_PATTERN = re.compile(r"\s*(\d+(?:\.\d+)?)\s*([KMG]B?|B)\s*", re.IGNORECASE)
+_SIZE_UNITS = {"B": 1, "K": 1024, "M": 1024**2, "G": 1024**3}
+
 def _parse_size(size_str: str) -> int:
-    """Parses a size string (e.g., '5MB', '100KB') into bytes."""
-    size_str = size_str.upper().strip()
-    units = {"B": 1, "KB": 1024, "MB": 1024**2, "GB": 1024**3}
+    """Parses a size string (e.g., '5MB', '100KB', '1G') into bytes."""
+    match = _SIZE_PATTERN.fullmatch(str(size_str))
+    if match is None:
+        return 0 # Default to 0 if parsing fails
+    number, unit = match.groups()
+    return int(float(number) * _SIZE_UNITS[unit[0].upper()])
+
+def _translate_glob_part(part: str) -> str:
+    """
+    Translates one path component of a glob into a regex, as `fnmatch` does,
+    except that no wildcard can match a `/`, so the regex stays within a component.
+    """
+    regex = []
+    i, n = 0, len(part)
+    while i < n:
+        char = part[i]
+        i += 1
+        if char == "*":
+            regex.append("[^/]*")
+        elif char == "?":
+            regex.append("[^/]")
+        elif char == "[":
+            j = i
+            if j < n and part[j] == "!":
+                j += 1
+            if j < n and part[j] == "]":
+                j += 1
+            while j < n and part[j] != "]":
+                j += 1
+            if j >= n:
+                regex.append("\\[")
+                continue
+            members = part[i:j].replace("\\", "\\\\")
+            i = j + 1
+            if members.startswith("!"):
+                members = "^" + members[1:]
+            elif members.startswith("^"):
+                members = "\\" + members
+            regex.append(f"(?!/)[{members}]")
+        else:
+            regex.append(re.escape(char))
+    return "".join(regex)
+
+@functools.lru_cache(maxsize=16)
+def _compile_excludes(patterns: Tuple[str, ...]) -> Optional[re.Pattern]:
+    """
+    Combines exclusion globs into one regex, searched against a path's POSIX
+    form, that matches wherever `Path.match` would match any of the globs:
+    relative globs match the trailing components of a path, absolute ones the
+    whole path, and `**` is an ordinary wildcard.
+
+    This spares `_is_excluded` a `Path.match` call, which parses its glob
+    again each time, per pattern per file.
+    """
+    alternatives = []
+    for pattern in dict.fromkeys(patterns):
+        if not pattern:
+            continue  # Path.match rejects empty globs, and they can't exclude anything
+        glob = PurePath(pattern)
+        anchor = glob.anchor.replace("\\", "/")
+        parts = glob.parts[1:] if anchor else glob.parts
+        body = "/".join(_translate_glob_part(part) for part in parts)
+        prefix = r"\A" + re.escape(anchor) if anchor else r"(?:\A|/)"
+        alternatives.append(prefix + body + r"\Z")
+    if not alternatives:
+        return None
+    # Paths are matched case-insensitively where the filesystem flavour is
+    flags = re.IGNORECASE if os.path.normcase("A") == "a" else 0
+    return re.compile("|".join(alternatives), flags)
+
+# How much of a file is sniffed for NUL bytes to tell binary files from text,
+# the same amount git checks before treating a file as binary.
+_BINARY_SNIFF_SIZE = 8000
+# Control bytes other than the whitespace ones (\t \n \v \f \r). Text without a NUL
+# byte is still treated as binary if more than this share of its sniffed prefix
+# is made of them.
+_CONTROL_BYTES = bytes(range(9)) + bytes(range(14, 32))
+_MAX_CONTROL_RATIO = 0.3
+
+# Extensions of formats that are always binary, skipped without being opened.
+# Minified JavaScript and other generated text is still scanned, as it can
+# carry secrets like any other source file.
+_BINARY_EXTENSIONS = frozenset({
+    ".png", ".jpg", ".jpeg", ".gif", ".bmp", ".ico", ".webp", ".tif", ".tiff",
+    ".pdf", ".zip", ".gz", ".tgz", ".bz2", ".xz", ".7z", ".rar", ".jar", ".whl",
+    ".woff", ".woff2", ".ttf", ".otf", ".eot",
+    ".so", ".dll", ".dylib", ".exe", ".o", ".a", ".pyc", ".class",
+    ".mp3", ".mp4", ".wav", ".ogg", ".mov", ".avi", ".webm",
+})
+
+def _read_text(file_path: Path) -> Optional[str]:
+    """
+    Reads a file as UTF-8 text through a read-only memory map, or returns None
+    if the file looks binary, i.e. its first bytes contain a NUL byte or are
+    mostly control characters.
+
+    The file is decoded straight from the mapped pages, which belong to the page
+    cache rather than the process, so the decoded string is the only full-size
+    copy of the file the scanner allocates. The binary sniff searches the same
+    mapping, so a file is opened once whether it turns out to be text or not.
+    Mapping the whole file already takes its size from the open descriptor, so
+    no separate stat is made for it, which matters on network filesystems.
+    """
+    fd = os.open(file_path, os.O_RDONLY)
     try:
-        if size_str[-2:] in units:
-            num = int(size_str[:-2])
-            unit = size_str[-2:]
-            return num * units[unit]
-        elif size_str[-1] in units:
-            num = int(size_str[:-1])
-            unit = size_str[-1]
-            return num * units[unit]
-    except (ValueError, KeyError):
-        pass
-    return 0 # Default to 0 if parsing fails
+        try:
+            mapped = mmap.mmap(fd, 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            return ""  # Empty files can't be mapped
+        with mapped:
+            head = mapped[:_BINARY_SNIFF_SIZE]
+            if b"\0" in head:
+                return None
+            control_bytes = len(head) - len(head.translate(None, _CONTROL_BYTES))
+            if control_bytes > len(head) * _MAX_CONTROL_RATIO:
+                return None
+            return str(mapped, "utf-8", errors="ignore")
+    finally:
+        os.close(fd)
+
+# The scanner used by the current worker process, set up by `_init_worker`.
+_worker_scanner: Optional["FileScanner"] = None
+
+def _init_worker(scanner: "FileScanner") -> None:
+    """Installs the scanner that `_collect_candidates_in_worker` uses in this process."""
+    global _worker_scanner
+    _worker_scanner = scanner
+
+def _collect_candidates_in_worker(file_path: Path) -> List[Dict[str, Any]]:
+    """Collects a single file's candidates with the scanner installed for this worker process."""
+    return _worker_scanner._collect_candidates(file_path)
+
+def _candidate_key(secret_value: str, detector_name: str) -> bytes:
+    """Hashes a (secret_value, detector) pair into a compact key for the verdict cache."""
+    return blake2b(f"{detector_name}\0{secret_value}".encode("utf-8", errors="surrogatepass"), digest_size=16).digest()
+
+def _normalize_candidate(raw: Tuple, detector: Any) -> Tuple[str, float, int, Optional[str], str]:
+    """
+    Converts a detector result into (candidate, confidence, line_number, context, detector_name).
+
+    Detectors report one of:
+      - (candidate, confidence, detector_name, detector_type, context)
+      - (candidate, line_number, line_content, detector_name), as the built-in detectors do
+      - (candidate, line_number, detector_name, reason), as UrlDetector and
+        DiscordWebhookDetector do, naming themselves after their class. These carry
+        no context, so None is returned for the caller to fill in.
+
+    Results without a confidence score are treated as certain.
+    """
+    if len(raw) == 5:
+        candidate, confidence, detector_name, _, context = raw
+        return candidate, confidence, 1, context or "", detector_name
+    if raw[2] == type(detector).__name__:
+        candidate, line_num, detector_name, _ = raw
+        return candidate, 1.0, line_num, None, detector_name
+    candidate, line_num, context, detector_name = raw
+    return candidate, 1.0, line_num, context or "", detector_name
+
+# The shortest time between two progress bar updates during a scan.
+_PROGRESS_INTERVAL = 0.1
+# How many candidates are collected before they're classified and their findings
+# yielded. Large enough for the classifier to batch and overlap its requests.
+_CLASSIFY_BATCH_SIZE = 256
+
+class _ProgressReporter:
+    """
+    Coalesces the per-file progress of a scan into at most one progress bar
+    update per `_PROGRESS_INTERVAL`, so large scans don't update the bar, and
+    take its lock, once or twice for every file.
+    """
+
+    def __init__(self, progress: Optional["Progress"], description: str):
+        self.progress = progress
+        self.task_id = progress.add_task(description, total=0) if progress else None
+        self.total = 0
+        self.completed = 0
+        # The first file is shown straight away
+        self._last_update = float("-inf")
+
+    def found(self) -> None:
+        """Records a file queued for scanning."""
+        self.total += 1
+        self._update()
+
+    def advance(self) -> None:
+        """Records a scanned file."""
+        self.completed += 1
+        self._update()
+
+    def _update(self) -> None:
+        now = time.monotonic()
+        if now - self._last_update >= _PROGRESS_INTERVAL:
+            self._last_update = now
+            self.flush()
+
+    def flush(self) -> None:
+        """Shows the current counts on the progress bar."""
+        if self.progress:
+            self.progress.update(self.task_id, total=self.total, completed=self.completed)
 
 class FileScanner:
     """
     Orchestrates the scanning of a given path for secrets.
     """
 
-    def __init__(self, root_path: str, config: Optional[Dict[str, Any]] = None):
+    def __init__(self, root_path: str, config: Optional[Dict[str, Any]] = None, use_processes: bool = True):
         """
         Initializes the scanner.
 
@@ -46,12 +251,26 @@ class FileScanner:
             root_path (str): The root directory or file path to scan.
             config (Optional[Dict[str, Any]]): A configuration dictionary. If not
                                                 provided, it will be loaded automatically.
+            use_processes (bool): Scan files in a pool of worker processes so the
+                                  CPU-bound detectors run in parallel. This needs the
+                                  scanner, including its detectors and classifier, to
+                                  be picklable; if it isn't, threads are used instead.
+                                  If False, a thread pool is always used, which can
+                                  suit I/O-bound scans such as network filesystems.
         """
         self.root_path = Path(root_path)
+        self.use_processes = use_processes
         self.config = config if config is not None else load_config()
         
-        # Pass the config to the classifier to ensure it uses the same settings
-        self.classifier = SecretClassifier(config=self.config)
+        # The classifier is created on first use, so scans without candidates never
+        # build an AI client, and it isn't copied into the worker processes.
+        self._classifier: Optional[SecretClassifier] = None
+        # Classifier verdicts by `_candidate_key`, so a secret is classified once per
+        # detector however many files, or scans with this scanner, it turns up in.
+        self._verdicts: Dict[bytes, Dict[str, Any]] = {}
+        # Files the last scan failed on, with the error, so callers can tell an
+        # incomplete scan from a clean one.
+        self.unscanned_files: List[Tuple[Path, str]] = []
  
         # Dynamically initialize detectors discovered via entry points
         self.detectors = []
@@ -67,107 +286,253 @@ class FileScanner:
                 self.detectors.append(DetectorClass(**kwargs))
  
         self.excluded_paths = rules_config.get("excluded_paths", [])
+        self._excluded = _compile_excludes(tuple(self.excluded_paths))
+        # Globs ending in "/**" exclude everything inside a directory, so a directory
+        # matching the rest of the glob isn't walked into at all.
+        self._excluded_dirs = _compile_excludes(tuple(
+            pattern[:-3] for pattern in self.excluded_paths if pattern.endswith("/**")
+        ))
         self.max_file_size = _parse_size(rules_config.get("max_file_size", "0"))
 
-    def _is_excluded(self, path: Path) -> bool:
-        """Checks if a file or directory should be excluded from the scan."""
-        for pattern in self.excluded_paths:
-            if path.match(pattern):
-                return True
-        
-        if self.max_file_size > 0 and path.is_file() and path.stat().st_size > self.max_file_size:
+    def _should_scan(self, path: Path, size: int) -> bool:
+        """
+        Checks a file against the exclusion patterns, the size limit and the
+        known binary extensions. Other binary files are skipped later, by the
+        worker that reads them.
+        """
+        return not self._is_excluded(str(path)) and self._within_size_limit(size)
+
+    def _is_excluded(self, path: str) -> bool:
+        """Checks a path against the known binary extensions and the exclusion patterns."""
+        if os.path.splitext(path)[1].lower() in _BINARY_EXTENSIONS:
             return True
-            
-        return False
+        return self._excluded is not None and self._excluded.search(path.replace(os.sep, "/")) is not None
+
+    def _is_excluded_dir(self, path: str) -> bool:
+        """Checks if a directory's whole contents are excluded."""
+        return self._excluded_dirs is not None and self._excluded_dirs.search(path.replace(os.sep, "/")) is not None
+
+    def _within_size_limit(self, size: int) -> bool:
+        """Checks a file size against the configured limit, if any."""
+        return not (self.max_file_size > 0 and size > self.max_file_size)
 
     def _find_files_to_scan(self) -> Iterator[Path]:
-        """Yields all non-excluded files from the root path."""
+        """Yields all files under the root path that should be scanned."""
         if self.root_path.is_file():
-            if not self._is_excluded(self.root_path):
+            if self._should_scan(self.root_path, self.root_path.stat().st_size):
                 yield self.root_path
             return
 
-        for file_path in self.root_path.rglob("*"):
-            if file_path.is_file() and not self._is_excluded(file_path):
-                yield file_path
+        # Excluded files are ruled out by name, before the walk stats them for their
+        # size, and excluded directories are never listed
+        for path, size in iter_files(str(self.root_path), skip=self._is_excluded, prune=self._is_excluded_dir):
+            if self._within_size_limit(size):
+                yield Path(path)
 
-    def _find_candidates_in_file(self, file_path: Path) -> Iterator[Tuple[str, int, str, str]]:
+    def _run_detectors(self, file_path: Path) -> Iterator[Tuple[Any, Tuple, str]]:
         """
-        Finds potential secrets (candidates) in a single file by running detectors.
+        Runs every detector over a single file, yielding (detector, result, content).
         """
         try:
-            with file_path.open("r", encoding="utf-8", errors="ignore") as f:
-                content = f.read()
- 
+            content = _read_text(file_path)
+            if content is None:
+                return  # Binary files aren't scanned
+
             for detector in self.detectors:
-                yield from detector.detect(content)
+                for result in detector.detect(content):
+                    yield detector, result, content
 
-        except (IOError, UnicodeDecodeError):
+        except (OSError, ValueError):
             # Silently ignore files that can't be opened or read
             pass
+
+    def _find_candidates_in_file(self, file_path: Path) -> Iterator[Tuple[str, int, str, str]]:
+        """
+        Finds potential secrets (candidates) in a single file by running detectors.
+        """
+        for _, result, _ in self._run_detectors(file_path):
+            yield result
             
-    def _process_file(self, file_path: Path) -> List[Dict[str, Any]]:    
+    def _collect_candidates(self, file_path: Path) -> List[Dict[str, Any]]:
         """
-        Processes a single file: finds candidates and classifies them.
-        This method is designed to be run in a separate thread.
+        Finds the candidates in a single file that meet the confidence threshold,
+        without classifying them. This method is designed to be run in a worker.
         """
-        file_findings = []
+        candidates = []
+        lines = None
+        # Resolving the path walks every component, so it's done once per file, and
+        # only for files with a candidate
+        resolved_path = None
         confidence_threshold = self.config.get("ai", {}).get("confidence_threshold", 0.8)
 
-        for candidate, confidence, detector_name, detector_type, reason in self._find_candidates_in_file(file_path):
-            # Ensure the detector provides a confidence score
+        for detector, raw, content in self._run_detectors(file_path):
+            candidate, confidence, line_num, context, detector_name = _normalize_candidate(raw, detector)
             if confidence >= confidence_threshold:
-                context_line = reason #context line
-                line_num = 1
-                if reason:
-                    context_line = reason
-                else:
-                    context_line = ""
-
-                ai_result = self.classifier.classify(candidate=candidate, context=context_line)
-
-                file_findings.append({
-                    "file": str(file_path.resolve()),
+                if context is None:
+                    # Give the classifier the reported line, as the built-in detectors do
+                    if lines is None:
+                        lines = content.splitlines()
+                    context = lines[line_num - 1].strip() if 0 < line_num <= len(lines) else ""
+                if resolved_path is None:
+                    resolved_path = str(file_path.resolve())
+                candidates.append({
+                    "file": resolved_path,
                     "line": line_num,
                     "secret_value": candidate,
-                    "reason": ai_result.get("reason", "No reason provided."),
+                    "context": context,
                     "detector": detector_name,
                 })
-        return file_findings
+        return candidates
+
+    def _classify(self, candidates: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Classifies candidates with a single batched classifier call and returns
+        them as findings. A secret reported by the same detector more than once,
+        e.g. in several files, is only sent to the classifier once; later
+        occurrences reuse its verdict. Detectors reporting the same secret in the
+        same context, e.g. on one line, share a single request too, since the
+        classifier only sees the secret and its context.
+        """
+        keys = [_candidate_key(c["secret_value"], c["detector"]) for c in candidates]
+        pending = {}
+        for key, candidate in zip(keys, candidates):
+            if key not in self._verdicts:
+                pending.setdefault(key, candidate)
+
+        if pending:
+            requests: Dict[Tuple[str, str], int] = {}
+            request_indexes = [
+                requests.setdefault((candidate["secret_value"], candidate["context"]), len(requests))
+                for candidate in pending.values()
+            ]
+            results = self.classifier.classify_batch([
+                {"candidate": candidate, "context": context} for candidate, context in requests
+            ])
+            self._verdicts.update((key, results[index]) for key, index in zip(pending, request_indexes))
+
+        return [
+            {
+                "file": candidate["file"],
+                "line": candidate["line"],
+                "secret_value": candidate["secret_value"],
+                "reason": self._verdicts[key].get("reason", "No reason provided."),
+                "detector": candidate["detector"],
+            }
+            for key, candidate in zip(keys, candidates)
+        ]
+
+    def _process_file(self, file_path: Path) -> List[Dict[str, Any]]:
+        """
+        Processes a single file: finds candidates and classifies them.
+        """
+        return self._classify(self._collect_candidates(file_path))
+
+
+    @property
+    def classifier(self) -> SecretClassifier:
+        """The AI classifier, created with this scanner's config when first needed."""
+        if self._classifier is None:
+            # Pass the config to the classifier to ensure it uses the same settings
+            self._classifier = SecretClassifier(config=self.config)
+        return self._classifier
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Workers only collect candidates, so the classifier (with its client's
+        # sessions and cache) and the verdicts stay in this process, on every scan
+        state = self.__dict__.copy()
+        del state["_classifier"], state["_verdicts"]
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._classifier = None
+        self._verdicts = {}
+
+    def _is_picklable(self) -> bool:
+        """
+        Checks whether the scanner can be sent to worker processes. Detector plugins
+        holding e.g. locks or open connections can't be, and are scanned in threads.
+        """
+        try:
+            pickle.dumps(self)
+        except (pickle.PicklingError, TypeError, AttributeError) as e:
+            log.warning("Scanner can't be sent to worker processes, scanning with threads instead: %s", e)
+            return False
+        return True
+
+    def scan(self, progress: Optional["Progress"] = None) -> List[Dict[str, Any]]:
+        """
+        Executes the full scan process and returns all findings.
 
+        Args:
+            progress (Optional[Progress]): A rich Progress object to update during the scan.
+        """
+        return list(self.iter_scan(progress=progress))
 
-    def scan(self, progress: Optional[Progress] = None) -> List[Dict[str, Any]]:
+    def iter_scan(self, progress: Optional["Progress"] = None) -> Iterator[Dict[str, Any]]:
         """
-        Executes the full scan process.
+        Executes the full scan process, yielding findings as they're classified.
 
         1. Finds all relevant files.
         2. Finds potential secret candidates in each file.
-        3. Uses the AI classifier to validate each candidate.
-        4. Collects and returns confirmed secrets.
+        3. Uses the AI classifier to validate the candidates, in batches.
+        4. Yields the findings of each batch, so output can start before the scan ends.
 
         Args:
             progress (Optional[Progress]): A rich Progress object to update during the scan.
         """
-        findings = []
-        files_to_scan = list(self._find_files_to_scan())
+        candidates = []
+        self.unscanned_files = []
+        # The total grows as files are found, since the walk isn't done upfront
+        reporter = _ProgressReporter(progress, "Scanning files...")
 
-        task_id = None
-        if progress:
-            task_id = progress.add_task("Scanning files...", total=len(files_to_scan))
+        # Detectors are pure-Python CPU work, so by default files are processed in
+        # worker processes to sidestep the GIL. Each worker receives a copy of this
+        # scanner once, when it starts, rather than once per file.
+        if self.use_processes and self._is_picklable():
+            executor = ProcessPoolExecutor(initializer=_init_worker, initargs=(self,))
+            collect_candidates = _collect_candidates_in_worker
+        else:
+            executor = ThreadPoolExecutor()
+            collect_candidates = self._collect_candidates
 
-        # Use a ThreadPoolExecutor to process files in parallel.
-        # This is effective because the work is I/O-bound (file reads and network requests).
-        with ThreadPoolExecutor() as executor:
-            # Submit each file to be processed in a separate thread
-            future_to_file = {executor.submit(self._process_file, file_path): file_path for file_path in files_to_scan}
-            
-            for future in as_completed(future_to_file):
-                if progress and task_id is not None:
-                    progress.update(task_id, advance=1)
-                try:
-                    findings.extend(future.result())
-                except Exception as e:
-                    # Optionally log errors for specific files
-                    pass
-
-        return findings
\ No newline at end of file
+        # At most this many files are queued or being scanned at once: enough to keep
+        # every worker busy (neither pool defaults to more than cpu_count() + 4), while
+        # a huge tree's futures and candidates don't pile up ahead of classification
+        max_pending = 2 * ((os.cpu_count() or 1) + 4)
+
+        with executor as pool:
+            # Files are submitted as the walk finds them, so workers start scanning
+            # while the rest of the tree is still being listed
+            files = self._find_files_to_scan()
+            pending: Dict[Future, Path] = {}
+            walking = True
+            while walking or pending:
+                while walking and len(pending) < max_pending:
+                    file_path = next(files, None)
+                    if file_path is None:
+                        walking = False
+                    else:
+                        pending[pool.submit(collect_candidates, file_path)] = file_path
+                        reporter.found()
+                if not pending:
+                    break
+
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    file_path = pending.pop(future)
+                    reporter.advance()
+                    try:
+                        candidates.extend(future.result())
+                    except Exception as e:
+                        log.warning("Could not scan %s: %s", file_path, e, exc_info=True)
+                        self.unscanned_files.append((file_path, repr(e)))
+                    # Candidates are classified in batches across files, so the classifier
+                    # can overlap its requests; repeated secrets are only classified once.
+                    if len(candidates) >= _CLASSIFY_BATCH_SIZE:
+                        yield from self._classify(candidates)
+                        candidates = []
+        reporter.flush()
+
+        if candidates:
+            yield from self._classify(candidates)
@@ -0,0 +1,42 @@
+import os
+from typing import Callable, Iterator, Optional, Tuple
+
+
+def iter_files(
+    root: str,
+    skip: Optional[Callable[[str], bool]] = None,
+    prune: Optional[Callable[[str], bool]] = None,
+) -> Iterator[Tuple[str, int]]:
+    """
+    Walks a directory tree, yielding (path, size) for every regular file.
+
+    Uses an explicit stack of directories and `os.scandir`, whose entries answer
+    the file-type checks from the directory listing itself, so the only stat
+    call per file is the one for its size. Symlinked directories are not
+    followed, which also keeps symlink loops from being walked forever.
+
+    Args:
+        root (str): The directory to walk.
+        skip (Optional[Callable[[str], bool]]): Called with the path of each file;
+                                                 files it returns True for are
+                                                 neither stat'ed nor yielded.
+        prune (Optional[Callable[[str], bool]]): Called with the path of each
+                                                  subdirectory; directories it returns
+                                                  True for are not walked into.
+    """
+    directories = [root]
+    while directories:
+        try:
+            entries = os.scandir(directories.pop())
+        except OSError:
+            continue
+        with entries:
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        if not (prune is not None and prune(entry.path)):
+                            directories.append(entry.path)
+                    elif entry.is_file() and not (skip is not None and skip(entry.path)):
+                        yield entry.path, entry.stat().st_size
+                except OSError:
+                    continue